@@ -0,0 +1,64 @@
+"""Compares holding for k steps one call at a time with `step(action, repeat=k)`.
+
+Usage:
+    python benchmarks/action_repeat.py
+"""
+
+import time
+
+import numpy as np
+
+from tensortrade.actions import ManagedRiskOrders
+from tensortrade.data import Stream
+from tensortrade.environments import TradingEnvironment
+from tensortrade.exchanges import Exchange
+from tensortrade.exchanges.services.execution.simulated import execute_order
+from tensortrade.instruments import USD, BTC
+from tensortrade.rewards import SimpleProfit
+from tensortrade.wallets import Portfolio, Wallet
+
+
+def make_env(n_steps: int) -> TradingEnvironment:
+    prices = 10000 + np.cumsum(np.random.RandomState(0).randn(n_steps))
+    exchange = Exchange("exchange", service=execute_order)(Stream("USD-BTC", prices))
+    portfolio = Portfolio(USD, [Wallet(exchange, 10000 * USD), Wallet(exchange, 10 * BTC)])
+
+    return TradingEnvironment(portfolio=portfolio,
+                              action_scheme=ManagedRiskOrders(),
+                              reward_scheme=SimpleProfit(),
+                              window_size=30,
+                              renderers=None)
+
+
+def per_step(env: TradingEnvironment, repeat: int) -> float:
+    env.reset()
+    steps = 0
+    done = False
+
+    start = time.perf_counter()
+
+    while not done:
+        if repeat == 1:
+            _, _, done, _ = env.step(0)
+            steps += 1
+        else:
+            _, _, done, info = env.step(0, repeat=repeat)
+            steps += info["steps"]
+
+    return (time.perf_counter() - start) / steps
+
+
+def main():
+    env = make_env(2000)
+    baseline = per_step(env, 1)
+
+    print("{:>8} {:>14} {:>10}".format("repeat", "per step (us)", "speedup"))
+    print("{:>8} {:>14.1f} {:>9.1f}x".format(1, 1e6 * baseline, 1))
+
+    for repeat in [8, 64, 512]:
+        t = per_step(env, repeat)
+        print("{:>8} {:>14.1f} {:>9.1f}x".format(repeat, 1e6 * t, baseline / t))
+
+
+if __name__ == "__main__":
+    main()
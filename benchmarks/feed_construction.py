@@ -0,0 +1,52 @@
+"""Measures the time it takes to build and compile large `DataFeed` graphs.
+
+Each graph has `n_markets` exchanges worth of price streams, with a chain of
+indicator-like transforms hanging off every price, so the number of nodes grows
+to well beyond 10k for the larger configurations.
+
+Usage:
+    python benchmarks/feed_construction.py
+"""
+
+import operator
+import time
+
+from tensortrade.data import DataFeed, Stream, BinOp
+
+
+def build(n_markets: int, depth: int) -> DataFeed:
+    nodes = []
+
+    for i in range(n_markets):
+        price = Stream("price-{}".format(i), [1.0, 2.0, 3.0])
+        volume = Stream("volume-{}".format(i), [3.0, 2.0, 1.0])
+
+        node = price
+        for j in range(depth):
+            node = BinOp("t-{}-{}".format(i, j), operator.mul)(node, volume)
+
+        nodes += [price, volume, node]
+
+    return DataFeed(nodes)
+
+
+def timed(f):
+    start = time.perf_counter()
+    result = f()
+    return result, time.perf_counter() - start
+
+
+def main():
+    print("{:>8} {:>10} {:>12} {:>12}".format("nodes", "build (s)", "compile (s)", "cached (s)"))
+
+    for n_markets, depth in [(100, 8), (500, 18), (1000, 18), (2500, 18)]:
+        feed, build_time = timed(lambda: build(n_markets, depth))
+        _, compile_time = timed(feed.compile)
+        _, cached_time = timed(feed.compile)
+
+        print("{:>8} {:>10.4f} {:>12.4f} {:>12.4f}".format(
+            len(feed.process), build_time, compile_time, cached_time))
+
+
+if __name__ == "__main__":
+    main()
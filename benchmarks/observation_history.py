@@ -0,0 +1,65 @@
+"""Compares the cost of pushing and observing a step of `ObservationHistory`
+with the pandas based history it replaced.
+
+Usage:
+    python benchmarks/observation_history.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from tensortrade.environments import ObservationHistory
+
+
+class PandasObservationHistory(object):
+    """The previous implementation, which appended to a `DataFrame` at every step."""
+
+    def __init__(self, window_size: int):
+        self.window_size = window_size
+        self.rows = pd.DataFrame()
+
+    def push(self, row: np.ndarray):
+        self.rows = self.rows.append(pd.Series(row), ignore_index=True)
+
+        if len(self.rows) > self.window_size:
+            self.rows = self.rows[-self.window_size:]
+
+    def observe(self) -> np.array:
+        rows = self.rows.copy()
+
+        if len(rows) < self.window_size:
+            size = self.window_size - len(rows)
+            padding = pd.DataFrame(np.zeros((size, rows.shape[1])), columns=self.rows.columns)
+            rows = pd.concat([padding, rows], ignore_index=True, sort=False)
+
+        return np.nan_to_num(rows.fillna(0, axis=1).values).astype(np.float32)
+
+
+def per_step(history, rows: np.ndarray) -> float:
+    start = time.perf_counter()
+
+    for row in rows:
+        history.push(row)
+        history.observe()
+
+    return (time.perf_counter() - start) / len(rows)
+
+
+def main():
+    n_features = 64
+    rows = np.random.randn(500, n_features)
+
+    print("{:>8} {:>14} {:>14} {:>10}".format("window", "pandas (us)", "ring (us)", "speedup"))
+
+    for window_size in [1, 30, 250]:
+        before = per_step(PandasObservationHistory(window_size), rows)
+        after = per_step(ObservationHistory(window_size, n_features), rows)
+
+        print("{:>8} {:>14.1f} {:>14.1f} {:>9.0f}x".format(
+            window_size, 1e6 * before, 1e6 * after, before / after))
+
+
+if __name__ == "__main__":
+    main()
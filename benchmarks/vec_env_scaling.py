@@ -0,0 +1,83 @@
+"""Measures how stepping many trading environments scales with the number of worker processes.
+
+Every configuration steps the same number of environments, each over its own
+synthetic market, first in process with `VecTradingEnvironment` and then with
+`SubprocVecTradingEnvironment` using 1 to `n_cpus` workers.
+
+Usage:
+    python benchmarks/vec_env_scaling.py [n_envs] [n_steps]
+"""
+
+import multiprocessing
+import sys
+import time
+
+from functools import partial
+
+import numpy as np
+
+from tensortrade.actions import ManagedRiskOrders
+from tensortrade.data import MarketData, Stream
+from tensortrade.environments import TradingEnvironment, VecTradingEnvironment, SubprocVecTradingEnvironment
+from tensortrade.exchanges import Exchange
+from tensortrade.exchanges.services.execution.simulated import execute_order
+from tensortrade.instruments import USD, BTC
+from tensortrade.rewards import SimpleProfit
+from tensortrade.wallets import Portfolio, Wallet
+
+
+def make_env(seed: int, n_steps: int) -> TradingEnvironment:
+    random = np.random.RandomState(seed)
+    close = 100 * np.exp(np.cumsum(random.normal(0, 0.01, n_steps + 1)))
+
+    market = MarketData([Stream("close", list(close)), Stream("volume", list(random.rand(n_steps + 1)))])
+    coinbase = Exchange("coinbase", service=execute_order)(*market.streams({"close": "USD-BTC"}))
+    portfolio = Portfolio(USD, [Wallet(coinbase, 10000 * USD), Wallet(coinbase, 1 * BTC)])
+
+    return TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=ManagedRiskOrders(),
+        reward_scheme=SimpleProfit(),
+        feed=market.feed(),
+        window_size=30,
+        renderers=None,
+        enable_logger=False
+    )
+
+
+def steps_per_second(env, n_envs: int, n_steps: int) -> float:
+    env.reset()
+
+    start = time.perf_counter()
+    for _ in range(n_steps):
+        env.step(np.zeros(n_envs, dtype=np.int64))
+
+    return n_envs * n_steps / (time.perf_counter() - start)
+
+
+def main():
+    n_envs = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    n_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    env_fns = [partial(make_env, seed, 2 * n_steps) for seed in range(n_envs)]
+
+    print("{:>10} {:>14} {:>10}".format("workers", "env steps/s", "speedup"))
+
+    env = VecTradingEnvironment([env_fn() for env_fn in env_fns])
+    baseline = steps_per_second(env, n_envs, n_steps)
+    env.close()
+
+    print("{:>10} {:>14.0f} {:>9.2f}x".format("in-proc", baseline, 1))
+
+    n_workers = 1
+    while n_workers <= min(multiprocessing.cpu_count(), n_envs):
+        env = SubprocVecTradingEnvironment(env_fns, n_workers=n_workers)
+        rate = steps_per_second(env, n_envs, n_steps)
+        env.close()
+
+        print("{:>10} {:>14.0f} {:>9.2f}x".format(n_workers, rate, rate / baseline))
+        n_workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -64,3 +64,11 @@ class ActionScheme(Component, TimeIndexed, metaclass=ABCMeta):
     def reset(self):
         """An optional reset method, which will be called each time the environment is reset."""
         pass
+
+    def snapshot(self) -> any:
+        """An optional method capturing the state of stateful schemes, called by `TradingEnvironment.snapshot`."""
+        return None
+
+    def restore(self, state: any):
+        """An optional method restoring the state captured by `snapshot`."""
+        pass
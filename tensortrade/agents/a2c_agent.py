@@ -87,6 +87,8 @@ class A2CAgent(Agent):
         self.actor_network = tf.keras.models.load_model(path + actor_filename)
         self.critic_network = tf.keras.models.load_model(path + critic_filename)
 
+        self.restore_normalizer(path + actor_filename.replace("actor_network__", "normalizer__").replace(".hdf5", ".npz"))
+
     def save(self, path: str, **kwargs):
         episode: int = kwargs.get('episode', None)
 
@@ -100,6 +102,7 @@ class A2CAgent(Agent):
 
         self.actor_network.save(path + actor_filename)
         self.critic_network.save(path + critic_filename)
+        self.save_normalizer(path + actor_filename.replace("actor_network__", "normalizer__").replace(".hdf5", ".npz"))
 
     def get_action(self, state: np.ndarray, **kwargs) -> int:
         threshold: float = kwargs.get('threshold', 0)
@@ -13,6 +13,8 @@
 # limitations under the License
 
 
+import os
+
 import numpy as np
 
 from abc import ABCMeta, abstractmethod
@@ -32,6 +34,20 @@ class Agent(Identifiable, metaclass=ABCMeta):
         """Save the agent to the directory specified in `path`."""
         raise NotImplementedError()
 
+    def save_normalizer(self, filename: str):
+        """Saves the observation statistics of the environment, if it normalizes its observations."""
+        normalizer = getattr(getattr(self, 'env', None), 'normalizer', None)
+
+        if normalizer is not None:
+            normalizer.save(filename)
+
+    def restore_normalizer(self, filename: str):
+        """Restores the observation statistics of the environment saved by `save_normalizer`."""
+        normalizer = getattr(getattr(self, 'env', None), 'normalizer', None)
+
+        if normalizer is not None and os.path.exists(filename):
+            normalizer.load(filename)
+
     @abstractmethod
     def get_action(self, state: np.ndarray, **kwargs) -> int:
         """Get an action for a specific state in the environment."""
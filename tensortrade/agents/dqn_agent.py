@@ -64,6 +64,8 @@ class DQNAgent(Agent):
         self.target_network = tf.keras.models.clone_model(self.policy_network)
         self.target_network.trainable = False
 
+        self.restore_normalizer(path.replace(".hdf5", "__normalizer.npz"))
+
     def save(self, path: str, **kwargs):
         episode: int = kwargs.get('episode', None)
 
@@ -73,6 +75,7 @@ class DQNAgent(Agent):
             filename = self.id + ".hdf5"
 
         self.policy_network.save(path + filename)
+        self.save_normalizer(path + filename.replace(".hdf5", "__normalizer.npz"))
 
     def get_action(self, state: np.ndarray, **kwargs) -> int:
         threshold: float = kwargs.get('threshold', 0)
@@ -32,13 +32,18 @@ class ParallelDQNAgent(Agent):
                  create_env: Callable[[None], 'TradingEnvironment'],
                  model: ParallelDQNModel = None):
         self.create_env = create_env
-        self.model = model or ParallelDQNModel(create_env=self.create_env)
+        self.env = create_env()
+        self.model = model or ParallelDQNModel(create_env=lambda: self.env)
 
     def restore(self, path: str, **kwargs):
         self.model.restore(path, **kwargs)
 
+        self.restore_normalizer(path.replace(".hdf5", "__normalizer.npz"))
+
     def save(self, path: str, **kwargs):
-        self.model.save(path, agent_id=self.id, **kwargs)
+        filename = self.model.save(path, agent_id=self.id, **kwargs)
+
+        self.save_normalizer(filename.replace(".hdf5", "__normalizer.npz"))
 
     def get_action(self, state: np.ndarray, **kwargs) -> int:
         return self.model.get_action(state, **kwargs)
@@ -65,6 +65,8 @@ class ParallelDQNModel:
 
         self.policy_network.save(path + filename)
 
+        return path + filename
+
     def get_action(self, state: np.ndarray, **kwargs) -> int:
         threshold: float = kwargs.get('threshold', 0)
 
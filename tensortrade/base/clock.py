@@ -21,8 +21,14 @@ class Clock(object):
     def now_formatted(self) -> str:
         return self.now().strftime("%H:%M:%S")
 
-    def increment(self):
-        self._step += 1
+    def increment(self, n: int = 1):
+        self._step += n
 
     def reset(self):
         self._step = self._start
+
+    def snapshot(self) -> int:
+        return self._step
+
+    def restore(self, step: int):
+        self._step = step
@@ -1,2 +1,2 @@
-from .wallet import create_wallet_source
+from .wallet import WalletLambda, create_wallet_source
 from .helpers import create_internal_feed
@@ -4,7 +4,7 @@ import operator
 
 from .wallet import create_wallet_source
 
-from tensortrade.data import DataFeed, Reduce, Condition
+from tensortrade.data import DataFeed, Reduce, Condition, NameMatch
 from tensortrade.wallets import Portfolio
 
 
@@ -12,15 +12,20 @@ def create_internal_feed(portfolio: 'Portfolio'):
 
     base_symbol = portfolio.base_instrument.symbol
     sources = []
+    exchanges = set()
 
     for wallet in portfolio.wallets:
         symbol = wallet.instrument.symbol
-        sources += [wallet.exchange]
+
+        if id(wallet.exchange) not in exchanges:
+            exchanges.add(id(wallet.exchange))
+            sources += [wallet.exchange]
+
         sources += [create_wallet_source(wallet, include_worth=(symbol != base_symbol))]
 
     worth_nodes = Condition(
         "worths",
-        lambda node: node.name.endswith(base_symbol + ":/total") or node.name.endswith("worth")
+        NameMatch.suffix(base_symbol + ":/total") | NameMatch.suffix("worth")
     )(*sources)
 
     net_worth = Reduce("net_worth", func=operator.add)(worth_nodes)
@@ -1,8 +1,35 @@
 
 import operator
 
-from tensortrade.data import Lambda, Module, Select, BinOp
-from tensortrade.wallets import Wallet
+from typing import Callable
+
+from tensortrade.data import Lambda, Module, Select, BinOp, NameMatch
+from tensortrade.wallets import Wallet, WalletListener
+
+
+class WalletLambda(Lambda, WalletListener):
+    """A `Lambda` over a wallet that is only re-evaluated after the wallet changes."""
+
+    def __init__(self, name: str, extract: Callable[[Wallet], float], wallet: Wallet):
+        super().__init__(name, extract, wallet)
+        self._dirty = True
+
+        wallet.attach(self)
+
+    def on_change(self, wallet: Wallet):
+        self._dirty = True
+
+    def run(self):
+        if self._dirty:
+            self.value = self.extract(self.obj)
+            self._dirty = False
+
+    def restore(self, state: dict):
+        super().restore(state)
+        self._dirty = True
+
+    def reset(self):
+        self._dirty = True
 
 
 def create_wallet_source(wallet: Wallet, include_worth=True):
@@ -10,15 +37,15 @@ def create_wallet_source(wallet: Wallet, include_worth=True):
     symbol = wallet.instrument.symbol
 
     with Module(exchange_name + ":/" + symbol) as wallet_ds:
-        free_balance = Lambda("free", lambda w: w.balance.size, wallet)
-        locked_balance = Lambda("locked", lambda w: w.locked_balance.size, wallet)
-        total_balance = Lambda("total", lambda w: w.total_balance.size, wallet)
-        is_empty = Lambda("is_empty", lambda w: (1 if w.total_balance.size<10 else 0), wallet)
+        free_balance = WalletLambda("free", lambda w: w.balance.size, wallet)
+        locked_balance = WalletLambda("locked", lambda w: w.locked_balance.size, wallet)
+        total_balance = WalletLambda("total", lambda w: w.total_balance.size, wallet)
+        is_empty = WalletLambda("is_empty", lambda w: (1 if w.total_balance.size<10 else 0), wallet)
 
         nodes = [free_balance, locked_balance, total_balance, is_empty]
 
         if include_worth:
-            price = Select(lambda node: node.name.endswith(symbol))(wallet.exchange)
+            price = Select(NameMatch.suffix(symbol))(wallet.exchange)
             worth = BinOp("worth", operator.mul)(price, total_balance)
             nodes += [worth]
 
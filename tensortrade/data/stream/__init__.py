@@ -1,5 +1,9 @@
 from .node import Node, Module
-from .source import Stream
+from .source import Stream, ArrayStream, AsyncStream
+from .index import NameIndex, NameMatch
 from .transform import BinOp, Select, Reduce, Lambda, Forward, Condition
+from .indicators import Indicator, RollingMean, RollingStd, RollingMin, RollingMax, EMA, RSI, macd, bollinger_bands
 from .listeners import NodeListener, FeedListener
-from .feed import DataFeed
+from .feed import DataFeed, Schema
+from .market import MarketData
+from .profiler import FeedProfiler
@@ -0,0 +1,192 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import operator
+
+import numpy as np
+
+from typing import List
+
+
+VECTORIZED_OPS = [
+    operator.add,
+    operator.sub,
+    operator.mul,
+    operator.truediv,
+    operator.pow,
+]
+
+
+def is_vectorized(op) -> bool:
+    """Whether or not `op` can be applied to whole columns at once."""
+    return isinstance(op, np.ufunc) or any(op is v for v in VECTORIZED_OPS)
+
+
+class StaticTable:
+    """The precomputed values of every static node of a compiled `DataFeed`.
+
+    A node is static when its whole history can be computed up front, which is
+    the case for array sources and for pure transforms of other static nodes.
+    Each static node is bound to one column of the table and reads its value
+    from the current row, so advancing the feed is a single row lookup.
+    """
+
+    def __init__(self, nodes: List['Node'], values: np.ndarray, indices: List[int] = None):
+        self.nodes = nodes
+        self.values = values
+        self.indices = indices if indices is not None else list(range(len(nodes)))
+        self.row = None
+        self._index = -1
+
+    @classmethod
+    def evaluate(cls, process: List['Node']) -> 'StaticTable':
+        """Evaluates the static subgraph of `process` over its full history.
+
+        Arguments:
+            process: The nodes of a feed, in topological order.
+
+        Returns:
+            The table of static values, or None if none of the nodes are static.
+        """
+        columns = {}
+
+        for node in process:
+            if len(node.inputs) == 0:
+                column = cls._precompute(node, [])
+
+                if column is not None:
+                    columns[node] = column
+
+        if len(columns) == 0:
+            return None
+
+        size = min(len(column) for column in columns.values())
+
+        for node in columns.keys():
+            columns[node] = columns[node][:size]
+
+        for node in process:
+            if len(node.inputs) == 0 or not all(n in columns for n in node.inputs):
+                continue
+
+            column = cls._precompute(node, [columns[n] for n in node.inputs])
+
+            if column is not None and len(column) == size:
+                columns[node] = column
+
+        nodes = list(columns.keys())
+        shared = cls._shared_columns([columns[node] for node in nodes])
+
+        if shared is not None:
+            values, indices = shared
+            values = values[:size]
+        else:
+            values = np.empty((size, len(nodes)), dtype=np.float64)
+            indices = list(range(len(nodes)))
+
+            for j, node in enumerate(nodes):
+                values[:, j] = columns[node]
+
+        table = cls(nodes, values, indices)
+        table.bind()
+
+        return table
+
+    @staticmethod
+    def _shared_columns(columns: List[np.ndarray]):
+        """Finds the two-dimensional array that every column is a view of, if any.
+
+        Feeds over a history shared with other feeds, such as a `MarketData`, then
+        read that array directly instead of copying it into a table of their own.
+
+        Returns:
+            The shared float64 array and the index of each column in it, or None.
+        """
+        base = columns[0]
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+
+        if base.ndim != 2 or base.dtype != np.float64 or base.strides[1] != base.itemsize:
+            return None
+
+        start = base.__array_interface__['data'][0]
+        indices = []
+
+        for column in columns:
+            offset = column.__array_interface__['data'][0] - start
+
+            if (column.dtype != np.float64
+                    or column.strides[0] != base.strides[0]
+                    or not 0 <= offset < base.strides[0]
+                    or not np.may_share_memory(column, base)):
+                return None
+
+            indices += [offset // base.itemsize]
+
+        return base, indices
+
+    @staticmethod
+    def _precompute(node: 'Node', inputs: List[np.ndarray]) -> np.ndarray:
+        """The history of `node` as a float64 column, or None if it cannot be precomputed."""
+        try:
+            with np.errstate(all='ignore'):
+                column = node.precompute(inputs)
+
+                if column is not None:
+                    column = np.asarray(column, dtype=np.float64)
+        except (TypeError, ValueError, ArithmeticError):
+            return None
+
+        return column
+
+    def bind(self):
+        for node, j in zip(self.nodes, self.indices):
+            node.bind(self, j)
+
+    def lookup(self, column: int) -> float:
+        return self.row[column]
+
+    @property
+    def remaining(self) -> int:
+        return len(self.values) - self._index - 1
+
+    def peek(self, n: int) -> np.ndarray:
+        """The next `n` rows of the table, without advancing."""
+        return self.values[self._index + 1:self._index + 1 + n]
+
+    def step(self, n: int = 1):
+        self._index += n
+        self.row = self.values[self._index]
+
+    def has_next(self) -> bool:
+        return self._index + 1 < len(self.values)
+
+    @property
+    def index(self) -> int:
+        """The row of the current step, or -1 before the first step."""
+        return self._index
+
+    def seek(self, index: int):
+        self._index = index
+        self.row = self.values[index] if index >= 0 else None
+
+    def reset(self):
+        self.seek(-1)
+
+    def __contains__(self, node: 'Node') -> bool:
+        return node._table is self
+
+    def __len__(self):
+        return len(self.values)
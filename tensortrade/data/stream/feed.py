@@ -13,79 +13,352 @@
 # limitations under the License.
 
 
-from typing import List
+
+import numpy as np
+
+from collections import OrderedDict, deque, namedtuple
+from typing import List, Iterator, Tuple
 
 from tensortrade.data.stream import Node
+from tensortrade.data.stream.columnar import StaticTable
+from tensortrade.data.stream.index import NameIndex
+from tensortrade.data.stream.transform import Select
 
 
-class DataFeed(Node):
+Schema = namedtuple('Schema', ['names', 'dtype'])
 
-    def __init__(self, nodes: List[Node] = None):
+
+class DataFeed(Node):
+    """A feed that runs a graph of nodes and emits the values of its inputs at every step.
+
+    Arguments:
+        nodes (optional): The nodes to output at every step.
+        columnar (optional): If `True`, every node whose full history is known in advance
+            (array sources and pure transforms of them) is evaluated once over the whole
+            history when the feed is compiled. Stepping the feed then only looks up the
+            next row of that table and runs the remaining live nodes, such as the
+            wallet balances of a portfolio.
+
+    Attributes:
+        profiler: An optional `FeedProfiler` recording the cost of every node run by the feed.
+        index: The `NameIndex` of every node of the graph, built when the feed is compiled.
+        chunk_size: The maximum number of rows `next_many` allocates at once for feeds
+            with live nodes.
+    """
+
+    chunk_size = 4096
+
+    def __init__(self, nodes: List[Node] = None, columnar: bool = False):
         super().__init__("")
 
         self.process = None
+        self.index = None
         self.compiled = False
+        self.columnar = columnar
+
+        self._profiler = None
+        self._plan = None
+
+        self._static = None
+        self._keys = None
+        self._outputs = None
+        self.pruned = []
+        self.deduplicated = []
+        self._static_outputs = None
+        self._live_outputs = None
+        self._schema = None
+        self._schema_index = None
+        self._row = None
+        self._buffer = None
 
         if nodes:
             self.__call__(*nodes)
 
+    @property
+    def profiler(self) -> 'FeedProfiler':
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler: 'FeedProfiler'):
+        """Sets the profiler of the feed, ending the profile of the previous one."""
+        if self._profiler is not None and self._profiler is not profiler:
+            self._profiler.stop()
+
+        self._profiler = profiler
+
     @staticmethod
     def _gather(node, vertices, edges):
-        if node not in vertices:
-            vertices += [node]
+        stack = [node]
+
+        while stack:
+            node = stack.pop()
+
+            if node in vertices:
+                continue
+
+            vertices.add(node)
 
             for input_node in node.inputs:
                 edges += [(input_node, node)]
 
-            for input_node in node.inputs:
-                DataFeed._gather(input_node, vertices, edges)
+            stack += reversed(node.inputs)
 
         return edges
 
     def gather(self):
-        return self._gather(self, [], [])
+        return self._gather(self, set(), [])
 
     @staticmethod
     def toposort(edges):
-        S = set([s for s, t in edges])
-        T = set([t for s, t in edges])
+        targets = OrderedDict()
+        in_degree = {}
 
-        starting = list(S.difference(T))
-        process = starting.copy()
+        for s, t in edges:
+            targets.setdefault(s, []).append(t)
+            targets.setdefault(t, [])
+            in_degree[t] = in_degree.get(t, 0) + 1
+
+        starting = deque(v for v in targets.keys() if v not in in_degree)
+        process = []
 
         while len(starting) > 0:
-            start = starting.pop()
+            start = starting.popleft()
 
-            edges = list(filter(lambda e: e[0] != start, edges))
+            if len(targets[start]) > 0:
+                process += [start]
 
-            S = set([s for s, t in edges])
-            T = set([t for s, t in edges])
+            for t in targets[start]:
+                in_degree[t] -= 1
 
-            starting += [v for v in S.difference(T) if v not in starting]
+                if in_degree[t] == 0:
+                    starting.append(t)
 
-            if start not in process:
-                process += [start]
+        return process
+
+    def plan(self) -> Tuple[List[Node], NameIndex]:
+        """Gets the execution order and the name index of the graph, reusing both until the graph changes.
+
+        The order and the index are kept with the `Node.graph_version` they were
+        planned at, so compiling the feed again, or reading its keys before compiling
+        it, skips gathering, sorting and indexing the graph as long as no node was
+        called or added to a module since.
+        """
+        version = Node.graph_version
+
+        if self._plan is None or self._plan[0] != version:
+            process = self.toposort(self.gather())
+            self._plan = (version, process, NameIndex(process))
+
+        _, process, index = self._plan
+
+        return list(process), index
+
+    @staticmethod
+    def ancestors(nodes: List[Node]) -> set:
+        """The set of `nodes` and of every node they depend on."""
+        visited = set()
+        stack = list(nodes)
+
+        while stack:
+            node = stack.pop()
+
+            if node not in visited:
+                visited.add(node)
+                stack += node.inputs
+
+        return visited
+
+    @staticmethod
+    def fingerprint(node: Node, canonical: dict) -> tuple:
+        """A key equal for nodes that compute the same values, or None if the node is unique.
+
+        Arguments:
+            node: The node to fingerprint.
+            canonical: The nodes already merged, mapped to the node that replaces them.
+        """
+        parameters = node.parameters()
+
+        if parameters is None:
+            return None
+
+        inputs = [node.resolve()] if isinstance(node, Select) else node.inputs
+
+        return type(node), parameters, tuple(id(canonical.get(n, n)) for n in inputs)
+
+    @classmethod
+    def eliminate_duplicates(cls, process: List[Node]) -> Tuple[List[Node], dict]:
+        """Merges the nodes of `process` that have the same type, parameters and inputs.
+
+        The nodes themselves are left untouched, since other feeds may share them. A
+        duplicate is dropped from the plan when every node of the plan reading it is
+        dropped too, and the outputs of the feed it produced are read from the first
+        node of its group instead.
+
+        Returns:
+            The process without the dropped duplicates, and the dropped duplicates
+            mapped to the nodes that replace them.
+        """
+        seen = {}
+        canonical = {}
+
+        for node in process:
+            key = cls.fingerprint(node, canonical)
+
+            if key is None:
+                continue
+
+            if key in seen:
+                canonical[node] = seen[key]
+            else:
+                seen[key] = node
+
+        dropped = set(canonical.keys())
+
+        for node in reversed(process):
+            if node not in dropped:
+                dropped.difference_update(node.inputs)
+
+        process = [node for node in process if node not in dropped]
+        canonical = {node: target for node, target in canonical.items() if node in dropped}
+
+        return process, canonical
+
+    def _resolve(self) -> List[Node]:
+        """Plans the graph and resolves its selections, without evaluating any node."""
+        process, self.index = self.plan()
+
+        for node in process:
+            if isinstance(node, Select):
+                node.resolve(self.index)
 
         return process
 
-    def compile(self):
-        edges = self.gather()
+    def compile(self, outputs: List[str] = None, dtype: np.dtype = np.float32, optimize: bool = True):
+        """Plans the execution of the graph and fixes the output schema of `next_array`.
+
+        When `optimize` is set, nodes that compute the same values, such as the same
+        indicator of the same source in two concatenated feeds, are merged in the plan
+        so that they run once per step, without rewiring the nodes themselves. The
+        merged nodes are listed in `deduplicated`.
+
+        When `outputs` are given, every node that neither they nor the listeners of
+        the feed depend on is pruned from the plan and from the outputs of the feed.
+        The pruned nodes are listed in `pruned` and in `summary()`.
+
+        Arguments:
+            outputs (optional): The names of the outputs to write into the vector returned
+                by `next_array`, in order. Defaults to all the outputs of the feed.
+            dtype (optional): The dtype of the vector returned by `next_array`.
+            optimize (optional): Whether or not to merge duplicate nodes.
+        """
+        process = self._resolve()
+
+        for node in process:
+            node.unbind()
+
+        canonical = {}
+
+        if optimize:
+            process, canonical = self.eliminate_duplicates(process)
+
+        self.deduplicated = list(canonical.keys())
+
+        outputs_by_name = OrderedDict()
+        for node in self.inputs:
+            outputs_by_name[node.name] = canonical.get(node, node)
+
+        names = list(outputs_by_name.keys()) if outputs is None else list(outputs)
+        missing = [name for name in names if name not in outputs_by_name]
+
+        if missing:
+            raise KeyError("Outputs {} are not produced by the feed.".format(missing))
 
-        self.process = self.toposort(edges)
+        self.pruned = []
+
+        if outputs is not None:
+            required = set(names)
+
+            for listener in self.listeners:
+                required.update(listener.required_outputs(list(outputs_by_name.keys())))
+
+            retained = self.ancestors([outputs_by_name[k] for k in required if k in outputs_by_name])
+
+            self.pruned = [node for node in process if node not in retained]
+            process = [node for node in process if node in retained]
+            outputs_by_name = OrderedDict((k, n) for k, n in outputs_by_name.items() if n in retained)
+
+        self._static = StaticTable.evaluate(process) if self.columnar else None
+
+        if self._static is not None:
+            process = [node for node in process if node not in self._static]
+
+        self.process = process
+        self._keys = list(outputs_by_name.keys())
+        self._outputs = list(outputs_by_name.values())
+
+        static = [(j, node._column) for j, node in enumerate(self._outputs) if node._table is not None]
+        self._static_outputs = np.array(static, dtype=np.int64).reshape(-1, 2)
+        self._live_outputs = [(j, node) for j, node in enumerate(self._outputs) if node._table is None]
+
+        keys = list(outputs_by_name.keys())
+
+        self._schema = Schema(names, np.dtype(dtype))
+        self._schema_index = np.array([keys.index(name) for name in names], dtype=np.int64)
+        self._row = np.zeros(len(keys), dtype=np.float64)
+        self._buffer = np.zeros(len(names), dtype=self._schema.dtype)
         self.compiled = True
         self.reset()
 
-    def run(self):
+    def summary(self) -> str:
+        """A description of the compiled plan of the feed."""
         if not self.compiled:
             self.compile()
 
+        n_static = len(self._static.nodes) if self._static is not None else 0
+
+        lines = ["DataFeed: {} nodes ({} static, {} live), {} outputs, {} pruned, {} deduplicated".format(
+            n_static + len(self.process), n_static, len(self.process), len(self._outputs), len(self.pruned),
+            len(self.deduplicated)
+        )]
+        lines += ["    pruned: {}".format(node.name) for node in self.pruned]
+        lines += ["    deduplicated: {}".format(node.name) for node in self.deduplicated]
+
+        return "\n".join(lines)
+
+    @property
+    def keys(self) -> List[str]:
+        """The names of the outputs of the feed, in order.
+
+        Before the feed is compiled, the names of all of its outputs, found from the
+        plan of the feed without evaluating it.
+        """
+        if not self.compiled:
+            self._resolve()
+            return list(OrderedDict.fromkeys(node.name for node in self.inputs))
+
+        return list(self._keys)
+
+    def _step(self):
+        if self._profiler is not None:
+            self._profiler.step(self._static, self.process)
+            return
+
+        if self._static is not None:
+            self._static.step()
+
         for node in self.process:
             node.run()
 
+    def run(self):
+        if not self.compiled:
+            self.compile()
+
+        self._step()
+
         super().run()
 
     def forward(self):
-        return {node.name: node.value for node in self.inputs}
+        return {key: node.value for key, node in zip(self._keys, self._outputs)}
 
     def next(self):
         self.run()
@@ -95,7 +368,150 @@ class DataFeed(Node):
 
         return self.value
 
+    @property
+    def schema(self) -> Schema:
+        """The names and dtype of the vector returned by `next_array`."""
+        if not self.compiled:
+            self.compile()
+
+        return self._schema
+
+    def next_array(self) -> np.ndarray:
+        """Advances the feed by one step and writes the outputs of its schema into a vector.
+
+        The vector is allocated once when the feed is compiled and is overwritten by
+        every call, so copy it if it has to outlive the step. Listeners are notified
+        through `on_next_many` with a single row holding every output of the feed.
+
+        Returns:
+            A vector with one value per name of `schema`, in the dtype of `schema`.
+        """
+        if not self.compiled:
+            self.compile()
+
+        self._step()
+
+        row = self._row
+
+        if self._static is not None:
+            row[self._static_outputs[:, 0]] = self._static.row[self._static_outputs[:, 1]]
+
+        for j, node in self._live_outputs:
+            row[j] = node.value
+
+        if self.listeners:
+            block = row[np.newaxis]
+            keys = self.keys
+
+            for listener in self.listeners:
+                listener.on_next_many(block, keys)
+
+        return np.take(row, self._schema_index, out=self._buffer)
+
+    def precomputed_outputs(self) -> Tuple[np.ndarray, List[int]]:
+        """The whole history of the precomputed outputs of the schema.
+
+        Returns:
+            An array of shape `(n_steps, len(schema.names))` in the dtype of the schema,
+            holding the values of the static outputs at every step of the feed and
+            zeros for the live outputs, and the positions of the live outputs in the
+            schema.
+        """
+        if not self.compiled:
+            self.compile()
+
+        if self._static is None:
+            raise ValueError("The feed has no precomputed outputs, compile it with `columnar=True`.")
+
+        columns = dict(zip(self._static_outputs[:, 0].tolist(), self._static_outputs[:, 1].tolist()))
+        values = np.zeros((len(self._static), len(self._schema_index)), dtype=self._schema.dtype)
+        live = []
+
+        for i, j in enumerate(self._schema_index.tolist()):
+            if j in columns:
+                values[:, i] = self._static.values[:, columns[j]]
+            else:
+                live += [i]
+
+        return values, live
+
+    def next_many(self, n: int) -> np.ndarray:
+        """Advances the feed by up to `n` steps in a single call.
+
+        Listeners are notified once with the whole block through `on_next_many`. The
+        block is never allocated beyond the rows left in the feed: `n` is clamped to
+        the rows left in the static table, and feeds with live nodes, whose length is
+        unknown, are filled in chunks of at most `chunk_size` rows.
+
+        Arguments:
+            n: The maximum number of steps to take.
+
+        Returns:
+            An array of shape `(k, len(keys))` with one row per step taken, where `k`
+            is smaller than `n` only if the feed runs out of data.
+        """
+        if not self.compiled:
+            self.compile()
+
+        keys = self.keys
+
+        if self._static is not None:
+            n = min(n, self._static.remaining)
+            rows, columns = self._static_outputs[:, 0], self._static_outputs[:, 1]
+
+        if self._static is not None and len(self.process) == 0:
+            block = np.empty((n, len(keys)), dtype=np.float64)
+            block[:, rows] = self._static.peek(n)[:, columns]
+
+            if n > 0:
+                self._static.step(n)
+        else:
+            chunks = []
+            size = 0
+
+            while size < n and self.has_next():
+                chunk = np.empty((min(n - size, self.chunk_size), len(keys)), dtype=np.float64)
+
+                if self._static is not None:
+                    chunk[:, rows] = self._static.peek(len(chunk))[:, columns]
+
+                filled = 0
+                while filled < len(chunk) and self.has_next():
+                    self._step()
+
+                    for j, node in self._live_outputs:
+                        chunk[filled, j] = node.value
+
+                    filled += 1
+
+                chunks += [chunk[:filled]]
+                size += filled
+
+            block = np.concatenate(chunks) if len(chunks) > 1 else (
+                chunks[0] if chunks else np.empty((0, len(keys)), dtype=np.float64))
+
+        if len(block) > 0:
+            for listener in self.listeners:
+                listener.on_next_many(block, keys)
+
+        return block
+
+    def schema_outputs(self, block: np.ndarray) -> np.ndarray:
+        """The outputs of the schema in a `block` returned by `next_many`, in the dtype of the schema."""
+        return block[:, self._schema_index].astype(self._schema.dtype)
+
+    def iter_blocks(self, size: int) -> Iterator[np.ndarray]:
+        """Iterates over the rest of the feed in blocks of up to `size` steps."""
+        while self.has_next():
+            yield self.next_many(size)
+
     def has_next(self) -> bool:
+        if not self.compiled:
+            self.compile()
+
+        if self._static is not None and not self._static.has_next():
+            return False
+
         return all(node.has_next() for node in self.process)
 
     def __add__(self, other):
@@ -103,13 +519,55 @@ class DataFeed(Node):
             raise TypeError(f'can only concatenate DataFeed (not "{type(other).__name__}") to DataFeed.')
 
         nodes = self.inputs + other.inputs
-        feed = DataFeed(nodes)
+        feed = DataFeed(nodes, columnar=self.columnar or other.columnar)
+        feed.profiler = self.profiler or other.profiler
 
         for listener in self.listeners + other.listeners:
             feed.attach(listener)
 
         return feed
 
-    def reset(self):
+    def snapshot(self) -> dict:
+        """Captures the position of every source and the state of every node of the feed.
+
+        The state can be given back to `restore` on the same compiled feed any number
+        of times, for example to branch several rollouts from one step.
+        """
+        if not self.compiled:
+            self.compile()
+
+        return {
+            'value': self.__dict__.get('_value'),
+            'static': self._static.index if self._static is not None else None,
+            'nodes': [node.snapshot() for node in self.process]
+        }
+
+    def restore(self, state: dict):
+        """Brings the feed back to the step at which `state` was captured by `snapshot`."""
+        self._value = state['value']
+
+        if self._static is not None:
+            self._static.seek(state['static'])
+
+        for node, node_state in zip(self.process, state['nodes']):
+            node.restore(node_state)
+
+    def reset(self, start: int = 0):
+        """Rewinds the feed, so that the next step is step `start` of its history.
+
+        Sources jump straight to `start`, without replaying the earlier steps. Stateful
+        nodes that are not precomputed, such as indicators in a feed that is not
+        columnar, start over from `start`.
+        """
+        if not self.compiled:
+            self.compile()
+
+        if self._static is not None:
+            self._static.seek(start - 1)
+
         for node in self.process:
             node.reset()
+
+            if start:
+                node.seek(start)
+
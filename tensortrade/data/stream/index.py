@@ -0,0 +1,128 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import re
+
+from bisect import bisect_left
+from typing import Iterable, List
+
+
+class NameIndex:
+    """An index of the nodes of a graph by name.
+
+    Exact lookups are a dictionary access, suffix lookups are a binary search over
+    the reversed names and pattern lookups scan the names once per pattern, after
+    which their result is cached. Every lookup returns the matching nodes in the
+    order they were given to the index.
+
+    Arguments:
+        nodes: The nodes to index.
+    """
+
+    _END = chr(0x10FFFF)
+
+    def __init__(self, nodes: Iterable['Node']):
+        self.nodes = list(nodes)
+
+        self._names = {}
+        for node in self.nodes:
+            self._names.setdefault(node.name, []).append(node)
+
+        self._position = {node: i for i, node in enumerate(self.nodes)}
+        self._reversed = sorted(name[::-1] for name in self._names.keys())
+        self._patterns = {}
+
+    def _ordered(self, nodes: List['Node']) -> List['Node']:
+        return sorted(nodes, key=self._position.__getitem__)
+
+    def exact(self, name: str) -> List['Node']:
+        return list(self._names.get(name, []))
+
+    def suffix(self, suffix: str) -> List['Node']:
+        key = suffix[::-1]
+        start = bisect_left(self._reversed, key)
+        stop = bisect_left(self._reversed, key + self._END, start)
+
+        return self._ordered([node for name in self._reversed[start:stop] for node in self._names[name[::-1]]])
+
+    def pattern(self, pattern: str) -> List['Node']:
+        """The nodes whose name contains a match of the regular expression `pattern`."""
+        nodes = self._patterns.get(pattern)
+
+        if nodes is None:
+            regex = re.compile(pattern)
+            names = [name for name in self._names.keys() if regex.search(name)]
+            nodes = self._ordered([node for name in names for node in self._names[name]])
+            self._patterns[pattern] = nodes
+
+        return list(nodes)
+
+    def __contains__(self, node: 'Node') -> bool:
+        return node in self._position
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+class NameMatch:
+    """A selector of nodes by name that can be resolved through a `NameIndex`.
+
+    Matches are also plain predicates on nodes, so they can be used anywhere a
+    selector function is expected. Use `exact`, `suffix` and `pattern` to create
+    them and combine them with `|`.
+    """
+
+    def __init__(self, kind: str, value):
+        self.kind = kind
+        self.value = value
+
+    @classmethod
+    def exact(cls, name: str) -> 'NameMatch':
+        return cls('exact', name)
+
+    @classmethod
+    def suffix(cls, suffix: str) -> 'NameMatch':
+        return cls('suffix', suffix)
+
+    @classmethod
+    def pattern(cls, pattern: str) -> 'NameMatch':
+        return cls('pattern', pattern)
+
+    def lookup(self, index: NameIndex) -> List['Node']:
+        """The nodes of `index` matched by this selector, in index order."""
+        if self.kind == 'any':
+            nodes = {node for match in self.value for node in match.lookup(index)}
+            return index._ordered(list(nodes))
+
+        return getattr(index, self.kind)(self.value)
+
+    def __call__(self, node: 'Node') -> bool:
+        if self.kind == 'exact':
+            return node.name == self.value
+        if self.kind == 'suffix':
+            return node.name.endswith(self.value)
+        if self.kind == 'pattern':
+            return re.search(self.value, node.name) is not None
+
+        return any(match(node) for match in self.value)
+
+    def __or__(self, other: 'NameMatch') -> 'NameMatch':
+        return NameMatch('any', (self, other))
+
+    def __str__(self):
+        if self.kind == 'any':
+            return " | ".join(str(match) for match in self.value)
+
+        return "{}({!r})".format(self.kind, self.value)
@@ -0,0 +1,374 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming technical indicators with constant amortized cost per step.
+
+Every indicator takes a single input node and keeps just enough state to update
+its value when the input moves forward one step, so indicators can be computed
+inside a `DataFeed` from raw prices instead of being precomputed offline.
+Window based indicators emit `nan` until their window is full and while their
+window holds a missing value, like the equivalent `pandas` rolling computations
+with their default `min_periods`. Missing values never enter the running state,
+so an indicator recovers as soon as they leave its window.
+"""
+
+import copy
+import math
+import operator
+
+import numpy as np
+
+from abc import abstractmethod
+from collections import deque
+from typing import List
+
+from .node import Node, Module
+from .transform import BinOp
+
+
+class Indicator(Node):
+    """A node that updates its value incrementally from the next value of its input.
+
+    Subclasses list the attributes holding their running state in `state`, so that
+    they can be captured by `snapshot` and brought back by `restore`.
+    """
+
+    state = ()
+
+    def forward(self):
+        return self.update(self.inputs[0].value)
+
+    @abstractmethod
+    def update(self, value: float) -> float:
+        raise NotImplementedError()
+
+    def precompute(self, inputs: List[np.ndarray]) -> np.ndarray:
+        self.reset()
+        values = np.array([self.update(v) for v in inputs[0].tolist()], dtype=np.float64)
+        self.reset()
+        return values
+
+    def snapshot(self) -> dict:
+        state = super().snapshot()
+        state.update({k: copy.copy(getattr(self, k)) for k in self.state})
+        return state
+
+    def restore(self, state: dict):
+        super().restore(state)
+
+        for k in self.state:
+            setattr(self, k, copy.copy(state[k]))
+
+    def has_next(self):
+        return True
+
+
+class RollingMean(Indicator):
+    """The mean over a rolling window, using a compensated running sum.
+
+    The sum is updated with Neumaier's summation, so values of very different
+    magnitudes entering and leaving the window do not lose precision.
+    """
+
+    state = ('_values', '_sum', '_compensation', '_nans')
+
+    def __init__(self, name: str, window: int):
+        super().__init__(name)
+        self.window = window
+        self.reset()
+
+    def parameters(self) -> tuple:
+        return self.window,
+
+    def _add(self, value: float):
+        if math.isnan(value):
+            return
+
+        total = self._sum + value
+
+        if abs(self._sum) >= abs(value):
+            self._compensation += (self._sum - total) + value
+        else:
+            self._compensation += (value - total) + self._sum
+
+        self._sum = total
+
+    def update(self, value: float) -> float:
+        self._values.append(value)
+        self._nans += math.isnan(value)
+        self._add(value)
+
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            self._nans -= math.isnan(old)
+            self._add(-old)
+
+        if len(self._values) < self.window or self._nans > 0:
+            return math.nan
+
+        return (self._sum + self._compensation) / self.window
+
+    def reset(self):
+        self._values = deque()
+        self._sum = 0
+        self._compensation = 0
+        self._nans = 0
+
+
+class RollingStd(Indicator):
+    """The population standard deviation over a rolling window, using Welford's updates.
+
+    Removing a value that dominates the window cancels most of the digits of the
+    running state, so the state is recomputed from the window whenever a removal
+    shrinks the sum of squared deviations by more than `RECOMPUTE_RATIO`.
+    """
+
+    state = ('_values', '_mean', '_m2', '_nans')
+
+    RECOMPUTE_RATIO = 1e-3
+
+    def __init__(self, name: str, window: int):
+        super().__init__(name)
+        self.window = window
+        self.reset()
+
+    def parameters(self) -> tuple:
+        return self.window,
+
+    def _recompute(self):
+        values = [v for v in self._values if not math.isnan(v)]
+
+        if len(values) == 0:
+            self._mean, self._m2 = 0, 0
+            return
+
+        self._mean = math.fsum(values) / len(values)
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in values)
+
+    def update(self, value: float) -> float:
+        self._values.append(value)
+
+        if math.isnan(value):
+            self._nans += 1
+        else:
+            n = len(self._values) - self._nans
+            delta = value - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (value - self._mean)
+
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+
+            if math.isnan(old):
+                self._nans -= 1
+            else:
+                n = len(self._values) - self._nans
+                m2 = self._m2
+
+                if n == 0:
+                    self._mean, self._m2 = 0, 0
+                else:
+                    delta = old - self._mean
+                    self._mean -= delta / n
+                    self._m2 -= delta * (old - self._mean)
+
+                    if m2 > 0 and self._m2 < m2 * self.RECOMPUTE_RATIO:
+                        self._recompute()
+
+        if len(self._values) < self.window or self._nans > 0:
+            return math.nan
+
+        return math.sqrt(max(self._m2, 0) / self.window)
+
+    def reset(self):
+        self._values = deque()
+        self._mean = 0
+        self._m2 = 0
+        self._nans = 0
+
+
+class RollingMax(Indicator):
+    """The maximum over a rolling window, using a monotonic deque."""
+
+    state = ('_candidates', '_step', '_last_nan')
+    compare = operator.le
+
+    def __init__(self, name: str, window: int):
+        super().__init__(name)
+        self.window = window
+        self.reset()
+
+    def parameters(self) -> tuple:
+        return self.window,
+
+    def update(self, value: float) -> float:
+        candidates = self._candidates
+
+        if math.isnan(value):
+            self._last_nan = self._step
+        else:
+            while candidates and self.compare(candidates[-1][1], value):
+                candidates.pop()
+
+            candidates.append((self._step, value))
+
+        while candidates and candidates[0][0] <= self._step - self.window:
+            candidates.popleft()
+
+        self._step += 1
+
+        if self._step < self.window or self._last_nan > self._step - 1 - self.window:
+            return math.nan
+
+        return candidates[0][1]
+
+    def reset(self):
+        self._candidates = deque()
+        self._step = 0
+        self._last_nan = -math.inf
+
+
+class RollingMin(RollingMax):
+    """The minimum over a rolling window, using a monotonic deque."""
+
+    compare = operator.ge
+
+
+class EMA(Indicator):
+    """The exponential moving average, equivalent to `ewm(span=span, adjust=False)`.
+
+    As in `pandas`, a missing value repeats the last average and decays its weight
+    against the next value that is not missing.
+
+    Arguments:
+        name: The name of the node.
+        span (optional): The span of the average, which sets `alpha = 2 / (span + 1)`.
+        alpha (optional): The smoothing factor, used instead of `span` if given.
+    """
+
+    state = ('_ema', '_weight')
+
+    def __init__(self, name: str, span: int = None, alpha: float = None):
+        super().__init__(name)
+
+        if alpha is None and span is None:
+            raise ValueError("EMA requires either a span or an alpha.")
+
+        self.alpha = alpha if alpha is not None else 2 / (span + 1)
+        self.reset()
+
+    def parameters(self) -> tuple:
+        return self.alpha,
+
+    def update(self, value: float) -> float:
+        if self._ema is None:
+            if not math.isnan(value):
+                self._ema = value
+            return value
+
+        self._weight *= 1 - self.alpha
+
+        if not math.isnan(value):
+            self._ema = (self._weight * self._ema + self.alpha * value) / (self._weight + self.alpha)
+            self._weight = 1
+
+        return self._ema
+
+    def reset(self):
+        self._ema = None
+        self._weight = 1
+
+
+class RSI(Indicator):
+    """The relative strength index, using Wilder's smoothing of gains and losses.
+
+    Missing values are skipped: they emit `nan` and the next change is measured
+    from the last value that was not missing.
+    """
+
+    state = ('_last', '_count', '_gain', '_loss')
+
+    def __init__(self, name: str, window: int = 14):
+        super().__init__(name)
+        self.window = window
+        self.reset()
+
+    def parameters(self) -> tuple:
+        return self.window,
+
+    def update(self, value: float) -> float:
+        if math.isnan(value):
+            return math.nan
+
+        if self._last is None:
+            self._last = value
+            return math.nan
+
+        change = value - self._last
+        gain, loss = max(change, 0), max(-change, 0)
+        self._last = value
+        self._count += 1
+
+        if self._count == 1:
+            self._gain, self._loss = gain, loss
+        else:
+            self._gain += (gain - self._gain) / self.window
+            self._loss += (loss - self._loss) / self.window
+
+        if self._count < self.window:
+            return math.nan
+
+        if self._loss == 0:
+            return 100.0
+
+        return 100 - 100 / (1 + self._gain / self._loss)
+
+    def reset(self):
+        self._last = None
+        self._count = 0
+        self._gain = 0
+        self._loss = 0
+
+
+def macd(node: Node, fast: int = 12, slow: int = 26, signal: int = 9, name: str = "macd") -> Module:
+    """Creates the moving average convergence divergence of a node.
+
+    Returns:
+        A module with the `macd`, `signal` and `histogram` nodes.
+    """
+    fast_ema = EMA(name + "-fast", span=fast)(node)
+    slow_ema = EMA(name + "-slow", span=slow)(node)
+
+    with Module(name) as macd_ds:
+        line = BinOp("macd", operator.sub)(fast_ema, slow_ema)
+        signal_line = EMA("signal", span=signal)(line)
+        BinOp("histogram", operator.sub)(line, signal_line)
+
+    return macd_ds
+
+
+def bollinger_bands(node: Node, window: int = 20, k: float = 2, name: str = "bb") -> Module:
+    """Creates the Bollinger bands of a node.
+
+    Returns:
+        A module with the `mid`, `upper` and `lower` band nodes.
+    """
+    std = RollingStd(name + "-std", window)(node)
+
+    with Module(name) as bb_ds:
+        mid = RollingMean("mid", window)(node)
+        BinOp("upper", lambda m, s: m + k * s)(mid, std)
+        BinOp("lower", lambda m, s: m - k * s)(mid, std)
+
+    return bb_ds
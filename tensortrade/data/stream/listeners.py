@@ -23,3 +23,19 @@ class FeedListener:
 
     def on_next(self, data):
         pass
+
+    def required_outputs(self, keys):
+        """The outputs of the feed, out of all of its `keys`, that this listener reads.
+
+        Nodes that neither these nor the requested outputs of a feed depend on can
+        be pruned when the feed is compiled.
+        """
+        return keys
+
+    def on_next_many(self, data, keys):
+        """Receives a block of steps from the feed, one row per step.
+
+        The block may be overwritten by the feed once this method returns.
+        """
+        for row in data:
+            self.on_next(dict(zip(keys, row)))
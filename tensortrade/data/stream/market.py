@@ -0,0 +1,86 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+
+from typing import Dict, List, Union
+
+from tensortrade.data.stream.node import Node
+from tensortrade.data.stream.source import ArrayStream
+from tensortrade.data.stream.feed import DataFeed
+
+
+class MarketData:
+    """The history of a graph of market nodes, computed once and shared by many environments.
+
+    The nodes are run through their whole history when the market data is created,
+    and every feed created from it reads its values from the same read-only array.
+    Environments built over the same market then only pay for their own portfolio
+    nodes: compiled columnar feeds bind straight to the shared array, without
+    copying it, and keep a cursor of their own.
+
+    Arguments:
+        nodes: The market nodes, such as prices and indicators, or a `DataFeed` of them.
+        block_size (optional): The number of steps evaluated at once while computing the history.
+    """
+
+    def __init__(self, nodes: Union[List[Node], DataFeed], block_size: int = 4096):
+        feed = nodes if isinstance(nodes, DataFeed) else DataFeed(nodes, columnar=True)
+        feed.compile()
+
+        blocks = list(feed.iter_blocks(block_size))
+
+        if blocks:
+            values = np.ascontiguousarray(np.concatenate(blocks), dtype=np.float64)
+        else:
+            values = np.empty((0, len(feed.keys)), dtype=np.float64)
+
+        values.setflags(write=False)
+
+        self.names = feed.keys
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def streams(self, names: Union[List[str], Dict[str, str]] = None) -> List[ArrayStream]:
+        """Creates new sources over columns of the shared history.
+
+        Arguments:
+            names (optional): The names of the columns to read, or a mapping from the
+                names of the columns to the names of the streams, for example to
+                name the price streams of an `Exchange` after their trading pairs.
+                Defaults to every column.
+
+        Returns:
+            One `ArrayStream` per column, each a view of the shared history.
+        """
+        if names is None:
+            names = self.names
+
+        if not isinstance(names, dict):
+            names = {name: name for name in names}
+
+        columns = {name: j for j, name in enumerate(self.names)}
+        missing = [name for name in names.keys() if name not in columns]
+
+        if missing:
+            raise KeyError("Columns {} are not in the market data.".format(missing))
+
+        return [ArrayStream(rename, self.values[:, columns[name]]) for name, rename in names.items()]
+
+    def feed(self, names: Union[List[str], Dict[str, str]] = None) -> DataFeed:
+        """Creates a new columnar feed over columns of the shared history, with a cursor of its own."""
+        return DataFeed(self.streams(names), columnar=True)
@@ -19,12 +19,29 @@ References:
     - https://github.com/tensorflow/tensorflow/blob/master/tensorflow/python/keras/engine/node.py
 """
 
+import itertools
+import threading
+
 from abc import abstractmethod
+from collections.abc import MutableSequence
+from typing import List
 from tensortrade.base.core import Observable
 import numpy as np
 
 
+_graph_versions = itertools.count(1)
+
+
 class Node(Observable):
+    """A node of a graph of streams.
+
+    Attributes:
+        graph_version: A counter bumped whenever the inputs of any node are set or a
+            node is added to a module, so that plans of a graph can be reused until
+            it changes.
+    """
+
+    graph_version = 0
 
     def __init__(self, name: str):
         super().__init__()
@@ -32,8 +49,13 @@ class Node(Observable):
         self._name = name
         self.inputs = []
 
-        if len(Module.CONTEXTS) > 0:
-            Module.CONTEXTS[-1].add_node(self)
+        self._table = None
+        self._column = None
+
+        contexts = Module.get_contexts()
+
+        if len(contexts) > 0:
+            contexts[-1].add_node(self)
 
     @property
     def name(self):
@@ -45,6 +67,8 @@ class Node(Observable):
 
     @property
     def value(self):
+        if self._table is not None:
+            return self._table.lookup(self._column)
         return self._value
 
     @value.setter
@@ -66,11 +90,34 @@ class Node(Observable):
             else:
                 self.inputs += [node]
 
+        Node.graph_version = next(_graph_versions)
+
         return self
 
+    def bind(self, table: 'StaticTable', column: int):
+        """Reads the value of the node from a column of a precomputed table."""
+        self._table = table
+        self._column = column
+
+    def unbind(self):
+        self._table = None
+        self._column = None
+
     def run(self):
         self.value = self.forward()
 
+    def precompute(self, inputs: List[np.ndarray]) -> np.ndarray:
+        """Computes the whole history of the node at once.
+
+        Arguments:
+            inputs: The full histories of the input nodes, in order.
+
+        Returns:
+            The values of the node at every step, or None if the node has to be
+            evaluated step by step.
+        """
+        return None
+
     @abstractmethod
     def forward(self):
         raise NotImplementedError()
@@ -79,6 +126,26 @@ class Node(Observable):
     def reset(self):
         raise NotImplementedError()
 
+    def parameters(self) -> tuple:
+        """The parameters that, with its type and its inputs, determine the values of the node.
+
+        Nodes with equal parameters are merged when a feed is compiled. Returns None,
+        the default, for nodes that must never be merged, such as nodes with state
+        outside of the graph.
+        """
+        return None
+
+    def seek(self, step: int):
+        """Moves the node to `step` of its history. Only sources have a position of their own."""
+        pass
+
+    def snapshot(self) -> dict:
+        """Captures the state of the node, so that `restore` can bring it back to the current step."""
+        return {'value': self.__dict__.get('_value')}
+
+    def restore(self, state: dict):
+        self._value = state['value']
+
     @abstractmethod
     def has_next(self):
         raise NotImplementedError()
@@ -91,9 +158,37 @@ class Node(Observable):
         return str(self)
 
 
+class _ContextStack(MutableSequence):
+    """The stack of modules open in the current thread, behind the former `Module.CONTEXTS` list."""
+
+    def __getitem__(self, i):
+        return Module.get_contexts()[i]
+
+    def __setitem__(self, i, module):
+        Module.get_contexts()[i] = module
+
+    def __delitem__(self, i):
+        del Module.get_contexts()[i]
+
+    def __len__(self):
+        return len(Module.get_contexts())
+
+    def insert(self, i, module):
+        Module.get_contexts().insert(i, module)
+
+
 class Module(Node):
+    """A node that names and groups the nodes created inside its `with` block.
+
+    The stack of open modules is kept per thread, so graphs can be built in
+    several threads at once without their nodes being added to each other.
+    `CONTEXTS` is kept for compatibility and reads and writes the stack of the
+    current thread.
+    """
+
+    contexts = threading.local()
 
-    CONTEXTS = []
+    CONTEXTS = _ContextStack()
 
     def __init__(self, name: str):
         super().__init__(name)
@@ -110,6 +205,8 @@ class Module(Node):
         else:
             self.variables += [node]
 
+        Node.graph_version = next(_graph_versions)
+
     def build(self):
         pass
 
@@ -121,12 +218,20 @@ class Module(Node):
 
         return nodes
 
+    @classmethod
+    def get_contexts(cls) -> List['Module']:
+        """The stack of modules open in the current thread."""
+        if not hasattr(cls.contexts, 'stack'):
+            cls.contexts.stack = []
+
+        return cls.contexts.stack
+
     def __enter__(self):
-        self.CONTEXTS += [self]
+        type(self).get_contexts().append(self)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.CONTEXTS.pop()
+        type(self).get_contexts().pop()
         return self
 
     def forward(self):
@@ -0,0 +1,136 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import time
+import tracemalloc
+
+import pandas as pd
+
+from typing import List
+
+
+class NodeStats:
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.calls = 0
+        self.total_time = 0.
+        self.allocated = 0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.
+
+
+class FeedProfiler:
+    """Records the cost of every node run by a `DataFeed`.
+
+    Set it as the `profiler` of a feed to start recording, and set the profiler of
+    the feed back to `None`, or call `stop`, to stop. Feeds without a profiler do not
+    pay for it.
+
+    Arguments:
+        allocations (optional): If `True`, also records the bytes allocated by each
+            node with `tracemalloc`, which slows down every step considerably. Tracing
+            is started on the first step if it is not already on, and stopped again
+            when the profile ends.
+    """
+
+    STATIC = "(static)"
+
+    def __init__(self, allocations: bool = False):
+        self.allocations = allocations
+        self._stats = {}
+        self._tracing = False
+
+    def _stats_for(self, node: 'Node') -> NodeStats:
+        stats = self._stats.get(node)
+
+        if stats is None:
+            if node is None:
+                stats = NodeStats(self.STATIC, "table")
+            else:
+                stats = NodeStats(node.name, type(node).__name__.lower())
+            self._stats[node] = stats
+
+        return stats
+
+    def _measure(self, key: 'Node', f):
+        stats = self._stats_for(key)
+
+        if self.allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+
+        start = time.perf_counter()
+        f()
+        stats.total_time += time.perf_counter() - start
+        stats.calls += 1
+
+        if self.allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            stats.allocated += max(peak, current) - before
+
+    def step(self, static: 'StaticTable', process: List['Node']):
+        """Advances the static table and runs every live node, recording their cost."""
+        if static is not None:
+            self._measure(None, static.step)
+
+        for node in process:
+            self._measure(node, node.run)
+
+    @property
+    def stats(self) -> List[NodeStats]:
+        return sorted(self._stats.values(), key=lambda s: s.total_time, reverse=True)
+
+    def to_frame(self) -> pd.DataFrame:
+        """The recorded statistics, one row per node, sorted by cumulative time."""
+        rows = [{
+            "name": s.name,
+            "type": s.kind,
+            "calls": s.calls,
+            "total_time": s.total_time,
+            "mean_time": s.mean_time,
+            "allocated": s.allocated
+        } for s in self.stats]
+
+        columns = ["name", "type", "calls", "total_time", "mean_time", "allocated"]
+        return pd.DataFrame(rows, columns=columns).set_index("name")
+
+    def report(self, limit: int = None) -> str:
+        """A table of the `limit` most expensive nodes."""
+        frame = self.to_frame()
+
+        if limit is not None:
+            frame = frame.head(limit)
+
+        if not self.allocations:
+            frame = frame.drop(columns=["allocated"])
+
+        return frame.to_string()
+
+    def stop(self):
+        """Ends the profile, stopping the allocation tracing if the profiler started it."""
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def reset(self):
+        self._stats = {}
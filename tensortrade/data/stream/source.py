@@ -13,7 +13,14 @@
 # limitations under the License.
 
 
-from typing import List
+import asyncio
+import queue
+import threading
+
+import numpy as np
+import pandas as pd
+
+from typing import Callable, Iterable, List, Union
 from tensortrade.data.stream.node import Node
 
 
@@ -21,7 +28,7 @@ class Stream(Node):
 
     def __init__(self, name: str, array: List[any] = None):
         super().__init__(name)
-        self._array = array if array else []
+        self._array = array if array is not None else []
         self._cursor = 0
 
     def forward(self):
@@ -29,6 +36,9 @@ class Stream(Node):
         self._cursor += 1
         return v
 
+    def precompute(self, inputs: List[np.ndarray]) -> np.ndarray:
+        return np.asarray(self._array, dtype=np.float64)
+
     def has_next(self) -> bool:
         if self._cursor < len(self._array):
             return True
@@ -36,3 +46,290 @@ class Stream(Node):
 
     def reset(self):
         self._cursor = 0
+
+    def parameters(self) -> tuple:
+        return id(self._array),
+
+    def seek(self, step: int):
+        self._cursor = step
+
+    def snapshot(self) -> dict:
+        state = super().snapshot()
+        state['cursor'] = self._cursor
+        return state
+
+    def restore(self, state: dict):
+        super().restore(state)
+        self._cursor = state['cursor']
+
+
+class ArrayStream(Stream):
+    """A stream over a NumPy array, a pandas column or a memory-mapped file.
+
+    The values are read straight from the backing buffer and are never copied
+    into a list, so several streams can share a single buffer, for example the
+    columns of one labeled data set.
+
+    Arguments:
+        name: The name of the stream.
+        array: A one-dimensional array, memmap or `pandas.Series` of values.
+    """
+
+    def __init__(self, name: str, array: Union[np.ndarray, pd.Series]):
+        if isinstance(array, pd.Series):
+            array = array.to_numpy(copy=False)
+
+        array = np.asarray(array)
+
+        if array.ndim != 1:
+            raise ValueError("ArrayStream requires a one-dimensional array, got shape {}.".format(array.shape))
+
+        super().__init__(name, array)
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._array
+
+    def precompute(self, inputs: List[np.ndarray]) -> np.ndarray:
+        if not np.issubdtype(self._array.dtype, np.number):
+            return None
+
+        return self._array
+
+    def parameters(self) -> tuple:
+        interface = self._array.__array_interface__
+        return interface['data'][0], interface['shape'], interface['strides'], interface['typestr']
+
+    def has_next(self) -> bool:
+        return self._cursor < self._array.shape[0]
+
+    @classmethod
+    def from_array(cls, array: np.ndarray, names: List[str]) -> List['ArrayStream']:
+        """Creates one stream per column of a two-dimensional array, each a view of `array`.
+
+        Arguments:
+            array: An array of shape `(n_steps, len(names))`.
+            names: The names of the streams, in column order.
+        """
+        if array.ndim != 2 or array.shape[1] != len(names):
+            raise ValueError("Expected an array with {} columns, got shape {}.".format(len(names), array.shape))
+
+        return [cls(name, array[:, i]) for i, name in enumerate(names)]
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> List['ArrayStream']:
+        """Creates one stream per column of `frame`.
+
+        When every column has the same dtype the streams are views of the frame's
+        own values, otherwise the frame is converted to a single array once.
+        """
+        return cls.from_array(frame.to_numpy(copy=False), [str(c) for c in frame.columns])
+
+    @classmethod
+    def from_memmap(cls,
+                    path: str,
+                    names: List[str],
+                    dtype: np.dtype = np.float64,
+                    offset: int = 0) -> List['ArrayStream']:
+        """Creates one stream per column of a raw, row-major binary file, without reading it into memory.
+
+        Files saved with `numpy.save` can be opened with `numpy.load(path, mmap_mode='r')`
+        and passed to `from_array` instead.
+
+        Arguments:
+            path: The path of the file.
+            names: The names of the columns stored in the file, in order.
+            dtype (optional): The dtype of the values in the file.
+            offset (optional): The number of bytes to skip at the start of the file.
+        """
+        array = np.memmap(path, dtype=dtype, mode='r', offset=offset)
+        return cls.from_array(array.reshape(-1, len(names)), names)
+
+
+class AsyncStream(Node):
+    """A stream whose values are produced in a background thread and prefetched into a bounded queue.
+
+    Slow sources, such as a live market poll or a large file read, then produce their
+    next values while the rest of the feed and the agent are working, instead of
+    stalling every call to `DataFeed.run()`.
+
+    The producer is a function returning either an iterable or an async iterable of
+    values. It is called again by every `reset`, so it should start over from the
+    beginning of its data. Async iterables run on an event loop owned by the thread
+    of the stream. Errors raised by the producer are raised again by `forward`.
+
+    Arguments:
+        name: The name of the stream.
+        producer: A function returning the iterable or async iterable of values.
+        buffer_size (optional): The maximum number of values prefetched ahead of the feed.
+        backpressure (optional): What the producer does when the buffer is full, either
+            'block' until the feed catches up, or 'drop' the oldest value in the buffer
+            to keep only the freshest values.
+        timeout (optional): The number of seconds to wait for the next value, or None
+            to wait for as long as it takes.
+        on_timeout (optional): What to do when no value arrives in time, either 'raise'
+            a `TimeoutError`, 'repeat' the last value, or emit 'nan'.
+        join_timeout (optional): The number of seconds `close` waits for the producer
+            thread to stop.
+    """
+
+    BACKPRESSURE = ['block', 'drop']
+    ON_TIMEOUT = ['raise', 'repeat', 'nan']
+
+    _END = object()
+
+    def __init__(self,
+                 name: str,
+                 producer: Callable[[], Iterable],
+                 buffer_size: int = 64,
+                 backpressure: str = 'block',
+                 timeout: float = None,
+                 on_timeout: str = 'raise',
+                 join_timeout: float = 1.0):
+        super().__init__(name)
+
+        if backpressure not in self.BACKPRESSURE:
+            raise ValueError("Backpressure must be one of {}, got {}.".format(self.BACKPRESSURE, backpressure))
+        if on_timeout not in self.ON_TIMEOUT:
+            raise ValueError("On timeout must be one of {}, got {}.".format(self.ON_TIMEOUT, on_timeout))
+
+        self.producer = producer
+        self.buffer_size = buffer_size
+        self.backpressure = backpressure
+        self.timeout = timeout
+        self.on_timeout = on_timeout
+        self.join_timeout = join_timeout
+
+        self._queue = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._pending = []
+        self._last = np.nan
+        self._done = False
+
+    def start(self):
+        """Starts prefetching values, which otherwise happens on the first call to `has_next` or `forward`."""
+        if self._thread is not None:
+            return
+
+        self._queue = queue.Queue(maxsize=self.buffer_size)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, args=(self._queue, self._stop), daemon=True)
+        self._thread.start()
+
+    def _produce(self, q: queue.Queue, stop: threading.Event):
+        try:
+            values = self.producer()
+
+            if hasattr(values, '__aiter__'):
+                asyncio.run(self._produce_async(values, q, stop))
+            else:
+                for value in values:
+                    if not self._put(value, q, stop, self.backpressure == 'drop'):
+                        return
+        except Exception as error:
+            self._put(_ProducerError(error), q, stop)
+            return
+
+        self._put(self._END, q, stop)
+
+    async def _produce_async(self, values, q: queue.Queue, stop: threading.Event):
+        async for value in values:
+            if not self._put(value, q, stop, self.backpressure == 'drop'):
+                return
+
+    def _put(self, value, q: queue.Queue, stop: threading.Event, drop: bool = False) -> bool:
+        """Puts a value into the buffer, returning False if the stream was stopped meanwhile."""
+        while not stop.is_set():
+            try:
+                q.put(value, block=not drop, timeout=0.05)
+                return True
+            except queue.Full:
+                if drop:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+        return False
+
+    def _fetch(self) -> bool:
+        """Waits for the next value, returning False if none arrived within the timeout."""
+        if self._pending or self._done:
+            return True
+
+        self.start()
+
+        try:
+            value = self._queue.get(timeout=self.timeout)
+        except queue.Empty:
+            if self.on_timeout == 'raise':
+                raise TimeoutError("No value from stream {} within {} seconds.".format(self.name, self.timeout))
+            return False
+
+        if value is self._END:
+            self._done = True
+        else:
+            self._pending.append(value)
+
+        return True
+
+    def forward(self):
+        if not self._fetch():
+            return self._last if self.on_timeout == 'repeat' else np.nan
+
+        if self._done:
+            raise IndexError("Stream {} has no more values.".format(self.name))
+
+        value = self._pending.pop()
+
+        if isinstance(value, _ProducerError):
+            raise value.error
+
+        self._last = value
+        return value
+
+    def has_next(self) -> bool:
+        self._fetch()
+        return not self._done
+
+    @property
+    def buffered(self) -> int:
+        """The number of values prefetched and not yet consumed."""
+        return len(self._pending) + (self._queue.qsize() if self._queue is not None else 0)
+
+    def close(self):
+        """Stops the producer thread.
+
+        The producer is signalled to stop and the buffer is drained, so a producer
+        waiting for room in the buffer stops straight away. A producer blocked on I/O
+        stops as soon as it yields its next value, which is discarded, and the stream
+        waits on it for at most `join_timeout` seconds. The thread is a daemon and
+        writes into a buffer of its own, so a later `start` is not affected by it.
+        """
+        if self._thread is None:
+            return
+
+        self._stop.set()
+
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+        self._thread.join(self.join_timeout)
+        self._thread = None
+        self._queue = None
+
+    def reset(self):
+        self.close()
+        self._pending = []
+        self._last = np.nan
+        self._done = False
+
+
+class _ProducerError:
+
+    def __init__(self, error: Exception):
+        self.error = error
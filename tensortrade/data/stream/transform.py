@@ -15,9 +15,13 @@
 
 import functools
 
-from typing import Union, Callable
+import numpy as np
+
+from typing import Union, Callable, List
 
 from .node import Node, Module
+from .columnar import is_vectorized
+from .index import NameIndex, NameMatch
 
 
 class BinOp(Node):
@@ -29,6 +33,16 @@ class BinOp(Node):
     def forward(self):
         return self.op(self.inputs[0].value, self.inputs[1].value)
 
+    def precompute(self, inputs: List[np.ndarray]) -> np.ndarray:
+        if is_vectorized(self.op):
+            return self.op(inputs[0], inputs[1])
+
+        values = [self.op(a, b) for a, b in zip(inputs[0].tolist(), inputs[1].tolist())]
+        return np.array(values, dtype=np.float64)
+
+    def parameters(self) -> tuple:
+        return id(self.op),
+
     def has_next(self):
         return True
 
@@ -47,6 +61,16 @@ class Reduce(Node):
     def forward(self):
         return functools.reduce(self.func, [node.value for node in self.inputs])
 
+    def precompute(self, inputs: List[np.ndarray]) -> np.ndarray:
+        if is_vectorized(self.func):
+            return functools.reduce(self.func, inputs)
+
+        rows = zip(*[column.tolist() for column in inputs])
+        return np.array([functools.reduce(self.func, row) for row in rows], dtype=np.float64)
+
+    def parameters(self) -> tuple:
+        return id(self.func),
+
     def has_next(self):
         return True
 
@@ -55,11 +79,17 @@ class Reduce(Node):
 
 
 class Select(Node):
+    """Forwards the first of its inputs matched by a selector.
+
+    Arguments:
+        selector: The exact name of the node to select, a `NameMatch`, or any
+            function of a node returning whether it should be selected.
+    """
 
-    def __init__(self, selector: Union[Callable[[str], bool], str]):
+    def __init__(self, selector: Union[Callable[['Node'], bool], NameMatch, str]):
         if isinstance(selector, str):
             self.key = selector
-            self.selector = lambda x: x.name == selector
+            self.selector = NameMatch.exact(selector)
         else:
             self.key = None
             self.selector = selector
@@ -67,13 +97,53 @@ class Select(Node):
         super().__init__(self.key or "select")
 
         self._node = None
+        self._positions = None
+
+    def __call__(self, *inputs):
+        self._positions = None
+        return super().__call__(*inputs)
+
+    def resolve(self, index: NameIndex = None) -> 'Node':
+        """Finds the selected node, once.
+
+        Arguments:
+            index (optional): An index of the graph, through which `NameMatch`
+                selectors are resolved without testing every input.
+        """
+        if self._node is None:
+            if index is not None and isinstance(self.selector, NameMatch):
+                positions = self._input_positions()
+                positions = [positions[node] for node in self.selector.lookup(index) if node in positions]
+                node = self.inputs[min(positions)] if positions else None
+            else:
+                node = next(filter(self.selector, self.inputs), None)
+
+            if node is None:
+                raise KeyError("No input of {} matches {}.".format(self.name, self.selector))
+
+            self._node = node
+            self.name = node.name
+
+        return self._node
+
+    def _input_positions(self) -> dict:
+        """The position of the first occurrence of every input, built once."""
+        if self._positions is None:
+            self._positions = {}
+
+            for i, node in enumerate(self.inputs):
+                self._positions.setdefault(node, i)
+
+        return self._positions
+
+    def parameters(self) -> tuple:
+        return ()
 
     def forward(self):
-        if not self._node:
-            self._node = list(filter(self.selector, self.inputs))[0]
-            self.name = self._node.name
+        return self.resolve().value
 
-        return self._node.value
+    def precompute(self, inputs: List[np.ndarray]) -> np.ndarray:
+        return inputs[self._input_positions()[self.resolve()]]
 
     def has_next(self):
         return True
@@ -109,10 +179,14 @@ class Forward(Lambda):
         )
         self(node)
 
+    def precompute(self, inputs: List[np.ndarray]) -> np.ndarray:
+        return inputs[0]
+
 
 class Condition(Module):
+    """A module of the inputs matched by a condition, such as a `NameMatch`."""
 
-    def __init__(self, name: str, condition: Callable[['Node'], bool]):
+    def __init__(self, name: str, condition: Union[Callable[['Node'], bool], NameMatch]):
         super().__init__(name)
         self.condition = condition
 
@@ -1,5 +1,8 @@
-from .observation_history import ObservationHistory
+from .observation_history import ObservationHistory, SlidingWindowHistory
+from .normalization import RunningNormalizer
+from .step_timer import StepTimer
 from .trading_environment import TradingEnvironment
+from .vec_trading_environment import VecTradingEnvironment, SubprocVecTradingEnvironment
 
 from . import render
 
@@ -0,0 +1,146 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+
+
+class RunningNormalizer(object):
+    """Standardizes observations with the running mean and variance of every feature.
+
+    The statistics are updated with Welford's algorithm from every row that is
+    normalized, until the normalizer is frozen. Rows are normalized in place and
+    every intermediate result is written into buffers allocated up front, so
+    normalizing a row does not allocate.
+
+    Arguments:
+        n_features: The number of values in a row.
+        epsilon (optional): Added to the standard deviations, to avoid dividing by zero.
+        clip (optional): If given, normalized values are clipped to `[-clip, clip]`.
+        dtype (optional): The dtype of the rows to normalize.
+    """
+
+    def __init__(self, n_features: int, epsilon: float = 1e-8, clip: float = None, dtype: np.dtype = np.float32):
+        self.n_features = n_features
+        self.epsilon = epsilon
+        self.clip = clip
+        self.dtype = np.dtype(dtype)
+        self.frozen = False
+
+        self.count = 0
+        self.mean = np.zeros(n_features, dtype=np.float64)
+        self._m2 = np.zeros(n_features, dtype=np.float64)
+
+        self._delta = np.zeros(n_features, dtype=np.float64)
+        self._scratch = np.zeros(n_features, dtype=np.float64)
+        self._shift = np.zeros(n_features, dtype=self.dtype)
+        self._scale = np.ones(n_features, dtype=self.dtype)
+
+    @property
+    def var(self) -> np.ndarray:
+        return self._m2 / self.count if self.count > 0 else np.ones(self.n_features)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.var)
+
+    def freeze(self):
+        """Stops updating the statistics, e.g. for evaluation."""
+        self.frozen = True
+
+    def unfreeze(self):
+        self.frozen = False
+
+    def update(self, row: np.ndarray):
+        """Adds a row to the running statistics."""
+        self.count += 1
+
+        np.subtract(row, self.mean, out=self._delta)
+        np.divide(self._delta, self.count, out=self._scratch)
+        np.add(self.mean, self._scratch, out=self.mean)
+
+        np.subtract(row, self.mean, out=self._scratch)
+        np.multiply(self._scratch, self._delta, out=self._scratch)
+        np.add(self._m2, self._scratch, out=self._m2)
+
+        self._refresh()
+
+    def _refresh(self):
+        self._shift[:] = self.mean
+
+        if self.count > 0:
+            np.divide(self._m2, self.count, out=self._scratch)
+            np.sqrt(self._scratch, out=self._scratch)
+            np.add(self._scratch, self.epsilon, out=self._scratch)
+            self._scale[:] = self._scratch
+        else:
+            self._scale[:] = 1
+
+    def normalize(self, row: np.ndarray) -> np.ndarray:
+        """Updates the statistics with `row`, unless frozen, and standardizes it in place.
+
+        Arguments:
+            row: A row, or a window of rows, of the dtype of the normalizer without
+                missing values.
+
+        Returns:
+            The same array, normalized.
+        """
+        if not self.frozen:
+            if row.ndim == 1:
+                self.update(row)
+            else:
+                for r in row:
+                    self.update(r)
+
+        np.subtract(row, self._shift, out=row)
+        np.divide(row, self._scale, out=row)
+
+        if self.clip is not None:
+            np.clip(row, -self.clip, self.clip, out=row)
+
+        return row
+
+    def get_state(self) -> dict:
+        """The statistics of the normalizer, which `set_state` loads back."""
+        return {
+            "count": self.count,
+            "mean": self.mean.copy(),
+            "m2": self._m2.copy(),
+            "frozen": self.frozen
+        }
+
+    def set_state(self, state: dict):
+        self.count = int(state["count"])
+        self.mean[:] = state["mean"]
+        self._m2[:] = state["m2"]
+        self.frozen = bool(state["frozen"])
+        self._refresh()
+
+    def save(self, path: str):
+        """Saves the statistics to a `.npz` file at `path`."""
+        with open(path, "wb") as fp:
+            np.savez(fp, **self.get_state())
+
+    def load(self, path: str):
+        """Loads statistics saved with `save`."""
+        with np.load(path) as state:
+            self.set_state(dict(state))
+
+    def reset(self):
+        """Forgets the statistics."""
+        self.count = 0
+        self.mean[:] = 0
+        self._m2[:] = 0
+        self._refresh()
@@ -13,41 +13,205 @@
 # limitations under the License.
 
 
-import collections
-import pandas as pd
 import numpy as np
 
+from numpy.lib.stride_tricks import as_strided
+from typing import List, Union
+
 
 class ObservationHistory(object):
+    """The last `window_size` observations, kept in a preallocated ring buffer.
+
+    Every row is written twice, `window_size` rows apart, into a buffer of twice
+    the size of the window, so that the current window is always one contiguous
+    slice of the buffer. Pushing a row costs `O(n_features)` and the window starts
+    out padded with zeros. Missing and infinite values are replaced as in
+    `numpy.nan_to_num` when they are pushed.
+
+    Arguments:
+        window_size: The number of observations in a window.
+        n_features (optional): The number of values in an observation. Defaults to the
+            length of the first observation pushed.
+        dtype (optional): The dtype of the observations.
+    """
 
-    def __init__(self, window_size: int):
+    def __init__(self, window_size: int, n_features: int = None, dtype: np.dtype = np.float32):
         self.window_size = window_size
-        self.rows = pd.DataFrame()
+        self.n_features = n_features
+        self.dtype = np.dtype(dtype)
+
+        self._buffer = None
+        self._position = 0
+
+        if n_features is not None:
+            self._allocate(n_features)
 
-    def push(self, row: dict):
+    def _allocate(self, n_features: int):
+        self.n_features = n_features
+        self._buffer = np.zeros((2 * self.window_size, n_features), dtype=self.dtype)
+        self._position = 0
+
+    def push(self, row: Union[dict, np.ndarray]):
         """Saves an observation."""
-        self.rows = self.rows.append(row, ignore_index=True)
+        if isinstance(row, dict):
+            row = np.fromiter(row.values(), dtype=np.float64, count=len(row))
+
+        if self._buffer is None:
+            self._allocate(len(row))
+
+        i = self._position
+        self._buffer[i] = row
+        np.nan_to_num(self._buffer[i], copy=False)
+        self._buffer[i + self.window_size] = self._buffer[i]
+
+        self._position = (i + 1) % self.window_size
+
+    def push_many(self, rows: np.ndarray):
+        """Saves several observations, oldest first. Only the last `window_size` are written."""
+        for row in rows[-self.window_size:]:
+            self.push(row)
+
+    def observe(self, copy: bool = True) -> np.array:
+        """Returns the rows to be observed by the agent, oldest first.
+
+        Arguments:
+            copy (optional): If `False`, returns a view of the buffer, which is only
+                valid until the next call to `push`.
+        """
+        if self._buffer is None:
+            return np.zeros((self.window_size, 0), dtype=self.dtype)
+
+        i = self._position
+        window = self._buffer[i:i + self.window_size]
+
+        return window.copy() if copy else window
+
+    def snapshot(self) -> tuple:
+        return (self._buffer.copy() if self._buffer is not None else None), self._position
+
+    def restore(self, state: tuple):
+        buffer, self._position = state
+
+        if buffer is None:
+            self._buffer = None
+        elif self._buffer is None or self._buffer.shape != buffer.shape:
+            self._buffer = buffer.copy()
+            self.n_features = buffer.shape[1]
+        else:
+            self._buffer[:] = buffer
+
+    def reset(self, start: int = 0):
+        """Clears the history. Windows always start padded with zeros, whatever the `start` of the episode."""
+        if self._buffer is not None:
+            self._buffer[:] = 0
+
+        self._position = 0
+
+
+class SlidingWindowHistory(object):
+    """Observation windows that are views of the whole history of a feed.
+
+    When most features are known in advance, every window is a slice of one
+    matrix holding the history of every feature. The precomputed features are
+    written into that matrix once, the live features, such as wallet balances,
+    are written into their columns of the current row by every `push`, and
+    `observe` returns the current window as a view, so windows are neither copied
+    nor duplicated in memory. As in `ObservationHistory`, the windows of an
+    episode start padded with zeros, whatever its `start`.
+
+    Arguments:
+        window_size: The number of observations in a window.
+        features: The history of the features, of shape `(n_steps, n_features)`,
+            such as the one returned by `DataFeed.precomputed_outputs`.
+        live (optional): The columns of the features that are pushed at every step.
+        dtype (optional): The dtype of the observations.
+    """
+
+    def __init__(self,
+                 window_size: int,
+                 features: np.ndarray,
+                 live: List[int] = None,
+                 dtype: np.dtype = np.float32):
+        self.window_size = window_size
+        self.n_features = features.shape[1]
+        self.dtype = np.dtype(dtype)
+        self.live = np.array(live if live is not None else [], dtype=np.int64)
+
+        self._features = np.zeros((window_size - 1 + len(features), self.n_features), dtype=self.dtype)
+        self._features[window_size - 1:] = np.nan_to_num(features)
+
+        self._step = 0
+        self._start = 0
+        self._padding = None
+
+    @property
+    def windows(self) -> np.ndarray:
+        """Every window of the history, as a view of shape `(n_steps, window_size, n_features)`."""
+        features = self._features
+        n_steps = len(features) - self.window_size + 1
+
+        return as_strided(features,
+                          shape=(n_steps, self.window_size, self.n_features),
+                          strides=(features.strides[0],) + features.strides,
+                          writeable=False)
+
+    def push(self, row: np.ndarray):
+        """Saves the live features of the next observation."""
+        if len(self.live) > 0:
+            values = self._features[self.window_size - 1 + self._step]
+            values[self.live] = np.nan_to_num(row[self.live])
+
+        self._step += 1
+
+    def push_many(self, rows: np.ndarray):
+        """Saves the live features of several observations, oldest first, in one assignment."""
+        if len(self.live) > 0:
+            start = self.window_size - 1 + self._step
+            values = self._features[start:start + len(rows)]
+            values[:, self.live] = np.nan_to_num(rows[:, self.live])
+
+        self._step += len(rows)
+
+    def observe(self, copy: bool = False) -> np.array:
+        """Returns the rows to be observed by the agent, oldest first.
+
+        Arguments:
+            copy (optional): If `False`, returns a view of the history, which is valid
+                until the history is reset.
+        """
+        window = self._features[self._step - 1:self._step - 1 + self.window_size]
+        return window.copy() if copy else window
+
+    def _pad(self, start: int):
+        """Zeroes the rows of the windows before step `start`, putting back the rows zeroed for the last start."""
+        if self._padding is not None:
+            rows, values = self._padding
+            self._features[rows] = values
 
-        if len(self.rows) > self.window_size:
-            self.rows = self.rows[-self.window_size:]
+        rows = slice(start, start + self.window_size - 1)
+        self._padding = rows, self._features[rows].copy()
+        self._features[rows] = 0
+        self._start = start
 
-    def observe(self) -> np.array:
-        """Returns the rows to be observed by the agent."""
-        rows = self.rows.copy()
+    def snapshot(self) -> tuple:
+        """Captures the step of the history, the start of its episode and the live features of its current window."""
+        rows = slice(max(self._step - 1, 0), self._step - 1 + self.window_size)
+        return self._step, self._start, self._features[rows][:, self.live].copy()
 
-        if len(rows) < self.window_size:
-            size = self.window_size - len(rows)
-            padding = np.zeros((size, rows.shape[1]))
-            padding = pd.DataFrame(padding, columns=self.rows.columns)
-            rows = pd.concat([padding, rows], ignore_index=True, sort=False)
+    def restore(self, state: tuple):
+        self._step, start, live = state
 
-        if isinstance(rows, pd.DataFrame):
-            rows = rows.fillna(0, axis=1)
-            rows = rows.values
+        if start != self._start:
+            self._pad(start)
 
-        rows = np.nan_to_num(rows)
+        rows = slice(max(self._step - 1, 0), self._step - 1 + self.window_size)
+        self._features[rows, self.live] = live
 
-        return rows
+    def reset(self, start: int = 0):
+        """Rewinds the history, so that the next observation pushed is step `start` of the features.
 
-    def reset(self):
-        self.rows = pd.DataFrame()
+        The rows of the window before `start` are zeroed, as in a new `ObservationHistory`,
+        and the precomputed features zeroed for a previous start are put back.
+        """
+        self._pad(start)
+        self._step = start
@@ -0,0 +1,160 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, List, Tuple
+
+
+class StepTimer:
+    """Records the wall time of every phase of the steps of a `TradingEnvironment`.
+
+    Set it as the `timer` of an environment to start recording. The time of each
+    phase of each step is written into a matrix with one row per step of the
+    episode, which is cleared when the environment is reset, so the statistics
+    always cover the current episode. Environments without a timer do not pay for it.
+
+    The phases are:
+        get_order: Turning the action into an order with the action scheme.
+        broker: Submitting the order to the broker and updating the broker.
+        feed: Advancing the feed, including the updates of the portfolio.
+        history: Normalizing, pushing and observing the observation history.
+        reward: Computing the reward with the reward scheme.
+        avail_actions: Updating the action mask.
+
+    Arguments:
+        capacity (optional): The number of steps to allocate room for up front.
+            The matrix doubles in size whenever an episode runs longer.
+    """
+
+    PHASES = ("get_order", "broker", "feed", "history", "reward", "avail_actions")
+
+    def __init__(self, capacity: int = 1024):
+        self._columns = {phase: j for j, phase in enumerate(self.PHASES)}
+        self._times = np.zeros((capacity, len(self.PHASES)), dtype=np.float64)
+        self._n = 0
+        self._last = None
+
+    def start(self):
+        """Starts timing a step."""
+        if self._n == len(self._times):
+            self._times = np.concatenate([self._times, np.zeros_like(self._times)])
+
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str):
+        """Adds the time elapsed since the last lap, or the start of the step, to `phase`."""
+        now = time.perf_counter()
+        self._times[self._n, self._columns[phase]] += now - self._last
+        self._last = now
+
+    def stop(self):
+        """Finishes timing a step."""
+        self._n += 1
+
+    @property
+    def steps(self) -> int:
+        return self._n
+
+    @property
+    def times(self) -> np.ndarray:
+        """The time of every phase of every step of the episode, of shape `(steps, n_phases)`."""
+        return self._times[:self._n]
+
+    def last(self) -> Dict[str, float]:
+        """The time of every phase of the last step."""
+        if self._n == 0:
+            return {}
+
+        row = self._times[self._n - 1]
+        return dict(zip(self.PHASES, row.tolist()), step=float(row.sum()))
+
+    def _column(self, phase: str) -> np.ndarray:
+        if phase == "step":
+            return self.times.sum(axis=1)
+
+        return self.times[:, self._columns[phase]]
+
+    def histogram(self, phase: str = "step", bins: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """A histogram of the time of `phase` over the steps of the episode.
+
+        Arguments:
+            phase (optional): The phase, or `step` for the whole step.
+            bins (optional): The number of bins, spaced logarithmically between the
+                fastest and the slowest step.
+
+        Returns:
+            The count of each bin and the edges of the bins, in seconds.
+        """
+        times = self._column(phase)
+        positive = times[times > 0]
+
+        if len(positive) == 0:
+            return np.histogram(times, bins=bins)
+
+        edges = np.geomspace(positive.min(), positive.max(), bins + 1)
+        edges[0] = 0
+
+        return np.histogram(times, bins=edges)
+
+    def stats(self, percentiles: List[float] = (50, 90, 99)) -> Dict[str, Dict[str, float]]:
+        """The statistics of every phase over the steps of the episode.
+
+        Arguments:
+            percentiles (optional): The percentiles of the time of each phase to report.
+
+        Returns:
+            For every phase, and for the whole `step`, the number of steps, the total,
+            mean and percentile times in seconds, keyed as `p50`, `p90`, etc. The
+            statistics of the whole step also hold the number of `steps_per_second`.
+        """
+        stats = {}
+
+        for phase in self.PHASES + ("step",):
+            times = self._column(phase)
+
+            stats[phase] = {
+                "calls": self._n,
+                "total_time": float(times.sum()),
+                "mean_time": float(times.mean()) if self._n else 0.
+            }
+
+            if self._n:
+                values = np.percentile(times, percentiles)
+                stats[phase].update({"p{:g}".format(p): float(v) for p, v in zip(percentiles, values)})
+
+        total = stats["step"]["total_time"]
+        stats["step"]["steps_per_second"] = self._n / total if total > 0 else 0.
+
+        return stats
+
+    def to_frame(self, percentiles: List[float] = (50, 90, 99)) -> pd.DataFrame:
+        """The statistics of `stats`, one row per phase."""
+        frame = pd.DataFrame.from_dict(self.stats(percentiles), orient="index")
+        frame.index.name = "phase"
+
+        return frame.drop(columns=["steps_per_second"])
+
+    def report(self) -> str:
+        """A table of the statistics of every phase."""
+        return self.to_frame().to_string()
+
+    def reset(self):
+        self._times[:self._n] = 0
+        self._n = 0
+        self._last = None
@@ -33,10 +33,10 @@ from tensortrade.data import DataFeed
 from tensortrade.data.internal import create_internal_feed
 from tensortrade.orders import Broker
 from tensortrade.wallets import Portfolio
-from tensortrade.environments import ObservationHistory
+from tensortrade.environments import ObservationHistory, SlidingWindowHistory, RunningNormalizer, StepTimer
 from tensortrade.environments.render import get
 
-from tensortrade.orders import Order, OrderListener, TradeSide, TradeType
+from tensortrade.orders import Order, OrderListener, OrderStatus, TradeSide, TradeType
 
 
 
@@ -46,6 +46,8 @@ class TradingEnvironment(gym.Env, TimeIndexed):
     agent_id: str = None
     episode_id: str = None
 
+    EMPTY_BALANCE = 5
+
     def __init__(self,
                  portfolio: Union[Portfolio, str],
                  action_scheme: Union[ActionScheme, str],
@@ -65,6 +67,21 @@ class TradingEnvironment(gym.Env, TimeIndexed):
                 String Values: 'screenlog', 'filelog', or 'plotly'. None for no rendering.
             price_history (optional): OHLCV price history feed used for rendering
                 the chart. Required if render_mode is 'plotly'.
+            sliding_windows (optional): If `True`, observations are views of the whole
+                history of a columnar feed, see `SlidingWindowHistory`. The views are
+                valid until the environment is reset.
+            normalizer (optional): A `RunningNormalizer` standardizing every observation
+                before it is saved in the history, or `True` to create one.
+            flat_observations (optional): If `True`, observations are written into
+                `observation_buffer`, a single contiguous array allocated once, holding
+                the action mask followed by the window, in row-major order. Every call to
+                `step`, `reset` and `restore` then returns the same dictionary, whose
+                `action_mask` and `real_obs` are views of the buffer that are overwritten
+                by the next call, so copy them to keep them.
+            timer (optional): A `StepTimer` recording the time of every phase of the
+                steps of the episode, or `True` to create one. See `stats`.
+            timings_in_info (optional): If `True`, the time of every phase of the step
+                is added to its info as `timings`. Requires a `timer`.
             kwargs (optional): Additional arguments for tuning the environments, logging, etc.
         """
         super().__init__()
@@ -77,11 +94,7 @@ class TradingEnvironment(gym.Env, TimeIndexed):
         self.use_internal = use_internal
         self._price_history: pd.DataFrame = kwargs.get('price_history', None)
 
-        if self.feed:
-            self._external_keys = self.feed.next().keys()
-            self.feed.reset()
-
-        self.history = ObservationHistory(window_size=window_size)
+        self.history = None
         self._broker = Broker(exchanges=self.portfolio.exchanges)
 
         self.clock = Clock()
@@ -104,6 +117,18 @@ class TradingEnvironment(gym.Env, TimeIndexed):
         self._observation_lows = kwargs.get('observation_lows', np.finfo(np.float32).min)
         self._observation_highs = kwargs.get('observation_highs', np.finfo(np.float32).max)
         self._max_allowed_loss = kwargs.get('max_allowed_loss', 0.1)
+        self._sliding_windows = kwargs.get('sliding_windows', False)
+        self._flat_observations = kwargs.get('flat_observations', False)
+        self.observation_buffer = None
+        self.normalizer = kwargs.get('normalizer', None)
+        self.timer = kwargs.get('timer', None)
+        self._timings_in_info = kwargs.get('timings_in_info', False)
+
+        if self.timer is True:
+            self.timer = StepTimer()
+
+        if self._timings_in_info and self.timer is None:
+            raise ValueError("Timings can only be added to the info of steps recorded by a `timer`.")
 
         if self._enable_logger:
             self.logger = logging.getLogger(kwargs.get('logger_name', __name__))
@@ -147,13 +172,40 @@ class TradingEnvironment(gym.Env, TimeIndexed):
         self.action_scheme.compile()
         self.action_space = self.action_scheme.action_space
 
+        external = self.feed.inputs if self.feed else []
+
         if not self.feed:
             self.feed = create_internal_feed(self.portfolio)
         else:
             self.feed = self.feed + create_internal_feed(self.portfolio)
 
-        initial_obs = self.feed.next()
-        n_features = len(initial_obs.keys()) if self.use_internal else (len(self._external_keys) + len(self.portfolio.wallets))
+        keys = self.feed.keys
+
+        if self.use_internal:
+            self._observation_keys = keys
+        else:
+            external_keys = {node.name for node in external}
+            self._observation_keys = [k for k in keys if k in external_keys or "is_empty" in k]
+
+        self.feed.compile(outputs=self._observation_keys, dtype=self._observation_dtype)
+        n_features = len(self._observation_keys)
+
+        if self.normalizer is True:
+            self.normalizer = RunningNormalizer(n_features, dtype=self._observation_dtype)
+
+        if self._sliding_windows and self.normalizer is not None:
+            raise ValueError("Sliding windows observe precomputed features, which cannot be normalized step by step.")
+
+        if self._sliding_windows:
+            features, live = self.feed.precomputed_outputs()
+            self.history = SlidingWindowHistory(window_size=self.window_size,
+                                                features=features,
+                                                live=live,
+                                                dtype=self._observation_dtype)
+        else:
+            self.history = ObservationHistory(window_size=self.window_size,
+                                              n_features=n_features,
+                                              dtype=self._observation_dtype)
 
         self.observation_space = gym.spaces.Dict({
             "action_mask": Box(0.0, 1.0, shape=(self.action_space.n, )),
@@ -167,29 +219,130 @@ class TradingEnvironment(gym.Env, TimeIndexed):
             })
 
 
-        
+        self._compile_action_masks()
+
+        if self._flat_observations:
+            self._compile_observation_buffer(n_features)
 
         self.feed.reset()
 
 
+    def _compile_action_masks(self):
+        """Builds the tables of the actions masked by empty wallets, once per compile.
+
+        Buy actions are masked while the base instrument has no balance left, and the
+        sell actions of a pair while a wallet of its quote instrument has no balance
+        left. Each action counts the conditions masking it, so the mask only has to be
+        updated for the wallets whose balance crossed the threshold since the last step.
+        Action 0 holds under every action scheme and is never masked.
+        """
+        n = self.action_space.n
+        actions = getattr(self.action_scheme, 'actions', None) or []
+
+        buy_indices = []
+        sell_indices = {}
+
+        for i, action in enumerate(actions[1:], start=1):
+            try:
+                (exchange, pair), params = action
+                side = params[-1]
+            except (TypeError, ValueError):
+                continue
+
+            if side == TradeSide.BUY:
+                buy_indices += [i]
+            elif side == TradeSide.SELL:
+                sell_indices.setdefault(str(pair), []).append(i)
+
+        base = self.portfolio.base_instrument
+
+        self._base_wallets = [w for w in self.portfolio.wallets if w.instrument == base]
+        self._buy_indices = np.array(buy_indices, dtype=np.int64)
+        self._sell_indices = [
+            (wallet, np.array(sell_indices.get(str(base / wallet.instrument), []), dtype=np.int64))
+            for wallet in self.portfolio.wallets if wallet.instrument != base
+        ]
+
+        self._mask_counts = np.zeros(n, dtype=np.int64)
+        self._base_empty = False
+        self._empty_wallets = {wallet: False for wallet, _ in self._sell_indices}
+
+        self.action_mask = np.ones(n)
+        self._avail_actions = np.arange(n).reshape(n, 1)
+        self._avail_actions.setflags(write=False)
+
+    def _compile_observation_buffer(self, n_features: int):
+        """Allocates `observation_buffer` and the observation made of views of it.
+
+        The first `action_space.n` values of the buffer are the action mask, which the
+        environment updates in place, and the rest is the window of shape
+        `(window_size, n_features)`.
+        """
+        n = self.action_space.n
+
+        self.observation_buffer = np.zeros(n + self.window_size * n_features, dtype=self._observation_dtype)
+        self.observation_buffer[:n] = self.action_mask
+        self.action_mask = self.observation_buffer[:n]
+
+        self._flat_observation = {
+            "action_mask": self.action_mask,
+            "avail_actions": self._avail_actions,
+            "real_obs": self.observation_buffer[n:].reshape(self.window_size, n_features)
+        }
+
+    def _mask(self, indices: np.ndarray, masked: bool):
+        self._mask_counts[indices] += 1 if masked else -1
+        self.action_mask[indices] = self._mask_counts[indices] == 0
+
     def update_avail_actions(self):
-        self.action_mask = np.array([1.] * self.action_space.n)
+        """Updates `action_mask` for the wallets that became empty, or stopped being empty."""
+        base_empty = sum(wallet.balance.size for wallet in self._base_wallets) < self.EMPTY_BALANCE
+
+        if base_empty != self._base_empty:
+            self._mask(self._buy_indices, base_empty)
+            self._base_empty = base_empty
+
+        for wallet, indices in self._sell_indices:
+            empty = wallet.balance.size < self.EMPTY_BALANCE
+
+            if empty != self._empty_wallets[wallet]:
+                self._mask(indices, empty)
+                self._empty_wallets[wallet] = empty
+
+    def _observe_history(self) -> np.ndarray:
+        if self._flat_observations:
+            return self.history.observe(copy=False)
 
-        #First mask any buy actions if USD = 0
-        #Find index of every BUY action, which are invalid when USD is zero.
-        if self.portfolio.base_balance < 5:
-            buy_indices = [i+1 for i, x in enumerate(self.action_scheme.actions[1:]) if x[1][3]==TradeSide.BUY]
-            for i in buy_indices:
-                self.action_mask[i] = 0
+        return self.history.observe()
 
-        #Now mask any sell actions for assets with zero balance left
-        #Find all exchange_pairs that have zero balance
-        empty_exchange_pairs = [self.portfolio.base_instrument/wallet.instrument for wallet in self.portfolio.wallets if wallet.balance < 5 and wallet.instrument != self.portfolio.base_instrument]
-        #Get the action index of these invalid sell actions
-        sell_indices = [i+1 for i, x in enumerate(self.action_scheme.actions[1:]) if x[0][1] in empty_exchange_pairs and x[1][3]==TradeSide.SELL]
-        for i in sell_indices:
-                self.action_mask[i] = 0
+    def _observation(self, real_obs: np.ndarray) -> Dict[str, np.ndarray]:
+        if self._flat_observations:
+            np.copyto(self._flat_observation["real_obs"], real_obs)
+            return self._flat_observation
 
+        return {
+            "action_mask": self.action_mask.copy(),
+            "avail_actions": self._avail_actions,
+            "real_obs": real_obs,
+        }
+
+    def _next_observation(self, timer: StepTimer = None) -> np.ndarray:
+        obs_row = self.feed.next_array()
+
+        if timer:
+            timer.lap("feed")
+
+        if self.normalizer is not None:
+            np.nan_to_num(obs_row, copy=False)
+            self.normalizer.normalize(obs_row)
+
+        self.history.push(obs_row)
+        obs = self._observe_history()
+
+        if timer:
+            timer.lap("history")
+
+        return obs
 
     @property
     def portfolio(self) -> Portfolio:
@@ -238,42 +391,139 @@ class TradingEnvironment(gym.Env, TimeIndexed):
     def price_history(self, price_history):
         self._price_history = price_history
 
-    def step(self, action: int) -> Tuple[np.array, float, bool, dict]:
+    def step(self, action: int, repeat: int = 1, until_event: bool = False) -> Tuple[np.array, float, bool, dict]:
         """Run one timestep within the environments based on the specified action.
 
+        With `repeat`, the action is taken on the first timestep and the agent holds
+        for the next ones, without being called. While the broker has no pending
+        orders, holding timesteps are simulated in blocks: the feed is advanced by
+        several steps at once and the rewards of the block are computed with the
+        `get_rewards` of the reward scheme. While a `timer` is set, holding timesteps
+        are run one by one instead, so that every timestep is recorded.
+
         Arguments:
             action: The trade action provided by the agent for this timestep.
+            repeat (optional): The number of timesteps to run, fewer if the episode ends first.
+            until_event (optional): If `True`, returns as soon as an order is executed,
+                filled or cancelled while holding, even before `repeat` timesteps.
 
         Returns:
             observation (pandas.DataFrame): Provided by the environments's exchange, often OHLCV or tick trade history data points.
-            reward (float): An size corresponding to the benefit earned by the action taken this timestep.
+            reward (float): An size corresponding to the benefit earned by the action taken this timestep,
+                summed over the timesteps run.
             done (bool): If `True`, the environments is complete and should be restarted.
-            info (dict): Any auxiliary, diagnostic, or debugging information to output.
+            info (dict): Any auxiliary, diagnostic, or debugging information to output. With
+                `repeat`, the info of the last timestep, with the number of timesteps run as `steps`.
         """
+        obs, reward, done, info = self._step(action)
 
-        order = self.action_scheme.get_order(action, self.portfolio)
-        #print("ORDER:", order)
+        if repeat == 1:
+            return obs, reward, done, info
 
-        if order:
-            self._broker.submit(order)
+        steps = 1
 
-        self._broker.update()
+        while steps < repeat and not done:
+            if self._broker.is_idle and self.timer is None:
+                obs, block_reward, done, info = self._advance(repeat - steps)
+                reward += block_reward
+                steps += info['steps']
+                continue
 
-        obs_row = self.feed.next()
+            events = self._broker_events() if until_event else None
 
-        if not self.use_internal:
-            obs_row = {k: obs_row[k] for k in self._external_keys ^ set([name for name in obs_row.keys() if "is_empty" in name])} 
+            obs, step_reward, done, info = self._step(None, hold=True)
+            reward += step_reward
+            steps += 1
 
+            if until_event and self._broker_events() != events:
+                break
 
+        info['steps'] = steps
 
-        self.history.push(obs_row)
+        return obs, reward, done, info
+
+    def _broker_events(self) -> tuple:
+        active = [o for o in self._broker.executed.values() if o.status in [OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED]]
+        return len(self._broker.unexecuted), len(self._broker.executed), len(active), sum(
+            len(trades) for trades in self._broker.trades.values())
+
+    def _advance(self, n: int) -> Tuple[Dict[str, np.ndarray], float, bool, dict]:
+        """Holds for up to `n` timesteps, advancing the feed in a single block.
+
+        The broker must be idle, so that nothing but the prices changes until the
+        episode ends. If the net worth falls below the allowed loss within the block,
+        the feed and the portfolio are rewound and only advanced up to that timestep.
+        """
+        state = self.feed.snapshot(), self.portfolio.snapshot()
+        block = self.feed.next_many(n)
+
+        initial_net_worth = self.portfolio.initial_net_worth
+        net_worth = self.portfolio.performance['net_worth'].values[-len(block):]
+        lost = np.flatnonzero(net_worth / initial_net_worth < self._max_allowed_loss)
 
-        obs = self.history.observe()
-        obs = obs.astype(self._observation_dtype)
+        if len(lost) > 0 and lost[0] < len(block) - 1:
+            self.feed.restore(state[0])
+            self.portfolio.restore(state[1])
+            block = self.feed.next_many(int(lost[0]) + 1)
+
+        size = len(block)
+        rows = self.feed.schema_outputs(block)
+
+        if self.normalizer is not None:
+            np.nan_to_num(rows, copy=False)
+            self.normalizer.normalize(rows)
+
+        self.history.push_many(rows)
+        obs = self._observe_history()
+
+        reward = float(self.reward_scheme.get_rewards(self._portfolio, size).sum())
+
+        if not np.isfinite(reward):
+            raise ValueError('Reward returned by the reward scheme must by a finite float.')
+        done = len(lost) > 0 or not self.feed.has_next()
+
+        info = {
+            'step': self.clock.step + size - 1,
+            'portfolio': self.portfolio,
+            'broker': self._broker,
+            'order': None,
+            'steps': size
+        }
+
+        self.clock.increment(size)
+        self.update_avail_actions()
+
+        return self._observation(obs), reward, done, info
+
+    def _step(self, action: int, hold: bool = False) -> Tuple[np.array, float, bool, dict]:
+        timer = self.timer
+
+        if timer:
+            timer.start()
+
+        order = self.action_scheme.get_order(action, self.portfolio) if not hold else None
+        #print("ORDER:", order)
+
+        if timer:
+            timer.lap("get_order")
+
+        if order:
+            self._broker.submit(order)
+
+        if not hold or not self._broker.is_idle:
+            self._broker.update()
+
+        if timer:
+            timer.lap("broker")
+
+        obs = self._next_observation(timer)
 
         reward = self.reward_scheme.get_reward(self._portfolio)
         reward = np.nan_to_num(reward)
 
+        if timer:
+            timer.lap("reward")
+
         if np.bitwise_not(np.isfinite(reward)):
             raise ValueError('Reward returned by the reward scheme must by a finite float.')
 
@@ -310,55 +560,112 @@ class TradingEnvironment(gym.Env, TimeIndexed):
         # else:
         #     reward = 1
         self.update_avail_actions()
-        obs = {
-            "action_mask": self.action_mask,
-            "avail_actions": np.array([[i] for i in list(range(self.action_space.n))]),
-            "real_obs": obs,
-        }
 
-        return obs, reward, done, info
+        if timer:
+            timer.lap("avail_actions")
+            timer.stop()
 
-    def reset(self) -> np.array:
+            if self._timings_in_info:
+                info['timings'] = timer.last()
+
+        return self._observation(obs), reward, done, info
+
+    def reset(self, start: int = 0) -> np.array:
         """Resets the state of the environments and returns an initial observation.
 
+        Arguments:
+            start (optional): The step of the feed to start the episode from.
+
         Returns:
             The episode's initial observation.
         """
 
         self.episode_id = uuid.uuid4()
         self.clock.reset()
-        self.feed.reset()
+        self.feed.reset(start)
         self.action_scheme.reset()
         self.reward_scheme.reset()
         self.portfolio.reset()
-        self.history.reset()
+        self.history.reset(start)
         self._broker.reset()
 
+        if self.timer:
+            self.timer.reset()
+
         for renderer in self._renderers:
             renderer.reset()
 
 
-        obs_row = self.feed.next()
-
-        if not self.use_internal:
-            obs_row = {k: obs_row[k] for k in self._external_keys ^ set([name for name in obs_row.keys() if "is_empty" in name])} 
-
-        self.history.push(obs_row)
-
-        obs = self.history.observe()
+        obs = self._next_observation()
 
         self.clock.increment()
 
         #Addition
         self.update_avail_actions()
-        obs = {
-            "action_mask": self.action_mask,
-            "avail_actions": np.array([[i] for i in list(range(self.action_space.n))]),
-            "real_obs": obs,
+
+        return self._observation(obs)
+
+    def snapshot(self) -> dict:
+        """Captures the state of the environment at the current step.
+
+        The state covers the clock, the position of the feed and the state of its
+        nodes, the balances and locked balances of the wallets, the orders of the
+        broker with their specs, the observation history and the action mask, and
+        the state of the action and reward schemes. Histories that are only ever
+        appended to, such as the performance of the portfolio, are kept by reference.
+
+        The state can be given back to `restore` any number of times, for example to
+        branch several short rollouts from one step.
+        """
+        return {
+            'clock': self.clock.snapshot(),
+            'feed': self.feed.snapshot(),
+            'portfolio': self.portfolio.snapshot(),
+            'broker': self._broker.snapshot(),
+            'action_scheme': self.action_scheme.snapshot(),
+            'reward_scheme': self.reward_scheme.snapshot(),
+            'history': self.history.snapshot(),
+            'normalizer': self.normalizer.get_state() if self.normalizer is not None else None,
+            'action_mask': (self.action_mask.copy(), self._mask_counts.copy(),
+                            self._base_empty, dict(self._empty_wallets))
         }
 
+    def restore(self, state: dict) -> Dict[str, np.ndarray]:
+        """Brings the environment back to the step at which `state` was captured by `snapshot`.
 
-        return obs
+        Arguments:
+            state: A state returned by `snapshot` on this environment, within the same episode.
+
+        Returns:
+            The observation at the restored step.
+        """
+        self.clock.restore(state['clock'])
+        self.portfolio.restore(state['portfolio'])
+        self._broker.restore(state['broker'])
+        self.feed.restore(state['feed'])
+        self.action_scheme.restore(state['action_scheme'])
+        self.reward_scheme.restore(state['reward_scheme'])
+        self.history.restore(state['history'])
+
+        if state['normalizer'] is not None:
+            self.normalizer.set_state(state['normalizer'])
+
+        action_mask, mask_counts, base_empty, empty_wallets = state['action_mask']
+        self.action_mask[:] = action_mask
+        self._mask_counts[:] = mask_counts
+        self._base_empty = base_empty
+        self._empty_wallets = dict(empty_wallets)
+
+        return self._observation(self._observe_history())
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """The statistics of the time of every phase of the steps of the episode.
+
+        Returns:
+            The statistics of `StepTimer.stats`, or an empty dictionary if the
+            environment has no `timer`.
+        """
+        return self.timer.stats() if self.timer else {}
 
     def render(self, episode: int = None):
         """Renders the environment.
@@ -0,0 +1,371 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+
+import multiprocessing
+import traceback
+
+import numpy as np
+
+from typing import Callable, Dict, List, Tuple, Union
+
+from tensortrade.environments import TradingEnvironment
+
+
+def _start(starts: Union[List[int], Callable[[int], int]], i: int) -> int:
+    if starts is None:
+        return 0
+    if callable(starts):
+        return starts(i)
+    return starts[i]
+
+
+class VecTradingEnvironment(object):
+    """Steps several trading environments in lockstep, with batched observations and actions.
+
+    The environments may trade over different markets or start from different
+    steps of their feeds, but must share their observation and action spaces.
+    An environment that is done is reset straight away, and the last observation
+    of its episode is kept in its info as `terminal_observation`.
+
+    Arguments:
+        envs: The environments to step.
+        starts (optional): The step of the feed each environment starts its episodes
+            from, either one step per environment or a function of the index of the
+            environment returning the step, e.g. to draw random offsets.
+    """
+
+    def __init__(self,
+                 envs: List[TradingEnvironment],
+                 starts: Union[List[int], Callable[[int], int]] = None):
+        if len(envs) == 0:
+            raise ValueError("VecTradingEnvironment requires at least one environment.")
+
+        self.envs = envs
+        self.starts = starts
+
+        self.observation_space = envs[0].observation_space
+        self.action_space = envs[0].action_space
+
+        for env in envs[1:]:
+            if env.observation_space != self.observation_space or env.action_space != self.action_space:
+                raise ValueError("Every environment must have the same observation and action spaces.")
+
+    @property
+    def num_envs(self) -> int:
+        return len(self.envs)
+
+    def _start(self, i: int) -> int:
+        return _start(self.starts, i)
+
+    def _stack(self, observations: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        return {key: np.stack([obs[key] for obs in observations]) for key in observations[0].keys()}
+
+    def reset(self) -> Dict[str, np.ndarray]:
+        """Resets every environment.
+
+        Returns:
+            The initial observations, with each array stacked along a new first axis.
+        """
+        return self._stack([env.reset(self._start(i)) for i, env in enumerate(self.envs)])
+
+    def step(self, actions: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, List[dict]]:
+        """Runs one step of every environment.
+
+        Arguments:
+            actions: One action per environment.
+
+        Returns:
+            observations: The observations, with each array stacked along a new first axis.
+            rewards: An array of one reward per environment.
+            dones: An array of whether or not the episode of each environment is done.
+            infos: The info of each environment.
+        """
+        if len(actions) != self.num_envs:
+            raise ValueError("Expected {} actions, got {}.".format(self.num_envs, len(actions)))
+
+        observations = []
+        rewards = np.empty(self.num_envs, dtype=np.float64)
+        dones = np.empty(self.num_envs, dtype=bool)
+        infos = []
+
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            obs, rewards[i], dones[i], info = env.step(int(action))
+
+            if dones[i]:
+                info = dict(info, terminal_observation={k: np.array(v) for k, v in obs.items()})
+                obs = env.reset(self._start(i))
+
+            observations += [obs]
+            infos += [info]
+
+        return self._stack(observations), rewards, dones, infos
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+
+def _worker(remote, parent_remote, env_fns: List[Callable[[], TradingEnvironment]], offset: int, starts):
+    from multiprocessing import resource_tracker
+    from multiprocessing.shared_memory import SharedMemory
+
+    parent_remote.close()
+
+    envs = []
+    blocks = []
+
+    try:
+        envs = [env_fn() for env_fn in env_fns]
+        remote.send(("spaces", (envs[0].observation_space, envs[0].action_space)))
+
+        arrays = {}
+
+        def write(j: int, obs: Dict[str, np.ndarray]):
+            arrays["real_obs"][j] = obs["real_obs"]
+            arrays["action_mask"][j] = obs["action_mask"]
+
+        while True:
+            command, data = remote.recv()
+
+            if command == "attach":
+                for key, (name, shape, dtype) in data.items():
+                    block = SharedMemory(name=name)
+                    blocks += [block]
+
+                    # The parent owns the block, so the tracker of the worker must not unlink it on exit.
+                    # The tracker knows the block by its POSIX name, with a leading slash.
+                    resource_tracker.unregister("/" + block.name, "shared_memory")
+
+                    arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)[offset:offset + len(envs)]
+
+                remote.send(("ok", None))
+
+            elif command == "reset":
+                for j, env in enumerate(envs):
+                    write(j, env.reset(_start(starts, offset + j)))
+
+                remote.send(("ok", None))
+
+            elif command == "step":
+                infos = []
+
+                for j, (env, action) in enumerate(zip(envs, data)):
+                    obs, reward, done, info = env.step(int(action))
+                    info = {"step": info["step"]}
+
+                    if done:
+                        info["terminal_observation"] = {k: np.array(v) for k, v in obs.items()}
+                        obs = env.reset(_start(starts, offset + j))
+
+                    write(j, obs)
+                    arrays["reward"][j] = reward
+                    arrays["done"][j] = done
+                    infos += [info]
+
+                remote.send(("ok", infos))
+
+            elif command == "close":
+                break
+
+    except Exception:
+        remote.send(("error", traceback.format_exc()))
+
+    finally:
+        for env in envs:
+            env.close()
+
+        for block in blocks:
+            block.close()
+
+        remote.close()
+
+
+class SubprocVecTradingEnvironment(object):
+    """Steps groups of trading environments in worker processes, with batched observations and actions.
+
+    Every worker builds and owns a group of environments. The workers write the
+    observations, action masks, rewards and dones of their environments straight
+    into arrays in shared memory, so only the actions and small control messages
+    are sent through the pipes. The infos returned by `step` only hold the step of
+    each environment and, when it is done, its terminal observation.
+
+    Arguments:
+        env_fns: Functions creating each environment, called in the worker processes.
+        n_workers (optional): The number of worker processes. Defaults to one per
+            environment, up to the number of CPUs.
+        starts (optional): The step of the feed each environment starts its episodes
+            from, as in `VecTradingEnvironment`.
+        start_method (optional): The `multiprocessing` start method of the workers.
+        join_timeout (optional): The number of seconds `close` waits for each worker
+            to exit before terminating it.
+
+    Requires Python 3.8 or later, for `multiprocessing.shared_memory`.
+    """
+
+    def __init__(self,
+                 env_fns: List[Callable[[], TradingEnvironment]],
+                 n_workers: int = None,
+                 starts: Union[List[int], Callable[[int], int]] = None,
+                 start_method: str = None,
+                 join_timeout: float = 5.0):
+        try:
+            from multiprocessing.shared_memory import SharedMemory
+        except ImportError:
+            raise ImportError("SubprocVecTradingEnvironment requires Python 3.8 or later.")
+
+        if len(env_fns) == 0:
+            raise ValueError("SubprocVecTradingEnvironment requires at least one environment.")
+
+        self.num_envs = len(env_fns)
+        self.n_workers = min(n_workers or multiprocessing.cpu_count(), self.num_envs)
+        self.join_timeout = join_timeout
+        self.closed = False
+
+        context = multiprocessing.get_context(start_method)
+        groups = np.array_split(np.arange(self.num_envs), self.n_workers)
+
+        self._remotes = []
+        self._processes = []
+        self._groups = []
+
+        for group in groups:
+            offset = int(group[0])
+            remote, worker_remote = context.Pipe()
+
+            process = context.Process(
+                target=_worker,
+                args=(worker_remote, remote, [env_fns[i] for i in group], offset, starts),
+                daemon=True
+            )
+            process.start()
+            worker_remote.close()
+
+            self._remotes += [remote]
+            self._processes += [process]
+            self._groups += [slice(offset, offset + len(group))]
+
+        spaces = self._receive_all()
+        self.observation_space, self.action_space = spaces[0]
+
+        real_obs = self.observation_space["real_obs"]
+        layout = {
+            "real_obs": ((self.num_envs,) + real_obs.shape, real_obs.dtype),
+            "action_mask": ((self.num_envs, self.action_space.n), np.float64),
+            "reward": ((self.num_envs,), np.float64),
+            "done": ((self.num_envs,), np.bool_)
+        }
+
+        self._blocks = {}
+        self._arrays = {}
+
+        for key, (shape, dtype) in layout.items():
+            size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            block = SharedMemory(create=True, size=size)
+            self._blocks[key] = block
+            self._arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+        attach = {key: (self._blocks[key].name, shape, dtype) for key, (shape, dtype) in layout.items()}
+        self._send_all("attach", [attach] * self.n_workers)
+        self._receive_all()
+
+        n_actions = self.action_space.n
+        self._avail_actions = np.broadcast_to(np.arange(n_actions)[:, np.newaxis], (self.num_envs, n_actions, 1))
+
+    def _send_all(self, command: str, data: list):
+        for remote, d in zip(self._remotes, data):
+            remote.send((command, d))
+
+    def _receive_all(self) -> list:
+        results = []
+
+        for remote in self._remotes:
+            status, result = remote.recv()
+
+            if status == "error":
+                self.close()
+                raise RuntimeError("A worker of the vectorized environment failed:\n" + result)
+
+            results += [result]
+
+        return results
+
+    def _observation(self) -> Dict[str, np.ndarray]:
+        return {
+            "action_mask": self._arrays["action_mask"].copy(),
+            "avail_actions": self._avail_actions.copy(),
+            "real_obs": self._arrays["real_obs"].copy()
+        }
+
+    def reset(self) -> Dict[str, np.ndarray]:
+        """Resets every environment.
+
+        Returns:
+            The initial observations, with each array stacked along a new first axis.
+        """
+        self._send_all("reset", [None] * self.n_workers)
+        self._receive_all()
+
+        return self._observation()
+
+    def step(self, actions: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, List[dict]]:
+        """Runs one step of every environment, each worker stepping its group in parallel.
+
+        Arguments:
+            actions: One action per environment.
+
+        Returns:
+            observations: The observations, with each array stacked along a new first axis.
+            rewards: An array of one reward per environment.
+            dones: An array of whether or not the episode of each environment is done.
+            infos: The info of each environment.
+        """
+        actions = np.asarray(actions)
+
+        if len(actions) != self.num_envs:
+            raise ValueError("Expected {} actions, got {}.".format(self.num_envs, len(actions)))
+
+        self._send_all("step", [actions[group] for group in self._groups])
+        infos = [info for group_infos in self._receive_all() for info in group_infos]
+
+        return self._observation(), self._arrays["reward"].copy(), self._arrays["done"].copy(), infos
+
+    def close(self):
+        """Stops the workers, terminating those still running after `join_timeout`, and frees the shared memory."""
+        if self.closed:
+            return
+
+        self.closed = True
+
+        for remote in self._remotes:
+            try:
+                remote.send(("close", None))
+            except (BrokenPipeError, EOFError):
+                pass
+
+        for process in self._processes:
+            process.join(self.join_timeout)
+
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+        for remote in self._remotes:
+            remote.close()
+
+        self._arrays = {}
+
+        for block in getattr(self, "_blocks", {}).values():
+            block.close()
+            block.unlink()
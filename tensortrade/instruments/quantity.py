@@ -15,6 +15,8 @@
 
 import operator
 
+import numpy as np
+
 from typing import Union, Tuple
 from numbers import Number
 
@@ -118,10 +120,10 @@ class Quantity:
         left, right = Quantity.validate(left, right)
         boolean = bool_op(left.size, right.size)
 
-        if not isinstance(boolean, bool):
+        if not isinstance(boolean, (bool, np.bool_)):
             raise Exception("`bool_op` cannot return a non-bool type ({}).".format(boolean))
 
-        return boolean
+        return bool(boolean)
 
     @staticmethod
     def _math_operation(left: Union['Quantity', float, int],
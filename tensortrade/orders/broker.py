@@ -57,6 +57,14 @@ class Broker(OrderListener, TimeIndexed):
         """The dictionary of trades the broker has executed since resetting, organized by order id."""
         return self._trades
 
+    @property
+    def is_idle(self) -> bool:
+        """Whether or not every order of the broker is filled or cancelled, so that `update` has nothing to do."""
+        if self._unexecuted:
+            return False
+
+        return all(o.status in [OrderStatus.FILLED, OrderStatus.CANCELLED] for o in self._executed.values())
+
     def submit(self, order: Order):
         self._unexecuted += [order]
 
@@ -102,6 +110,31 @@ class Broker(OrderListener, TimeIndexed):
                 if next_order:
                     self.submit(next_order)
 
+    def snapshot(self) -> dict:
+        """Captures the orders of the broker, their state and their trades.
+
+        Filled and cancelled orders no longer change, so only the state of the
+        active orders is captured.
+        """
+        orders = self._unexecuted + list(self._executed.values())
+        active = [o for o in orders if o.status not in [OrderStatus.FILLED, OrderStatus.CANCELLED]]
+
+        return {
+            'unexecuted': list(self._unexecuted),
+            'executed': dict(self._executed),
+            'trades': OrderedDict((k, list(v)) for k, v in self._trades.items()),
+            'orders': [(order, order.snapshot()) for order in active]
+        }
+
+    def restore(self, state: dict):
+        """Brings the broker and its orders back to the state captured by `snapshot`."""
+        self._unexecuted = list(state['unexecuted'])
+        self._executed = dict(state['executed'])
+        self._trades = OrderedDict((k, list(v)) for k, v in state['trades'].items())
+
+        for order, order_state in state['orders']:
+            order.restore(order_state)
+
     def reset(self):
         self._unexecuted = []
         self._executed = {}
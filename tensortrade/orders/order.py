@@ -217,6 +217,29 @@ class Order(TimedIdentifiable):
         for wallet in self.portfolio.wallets:
             wallet.deallocate(self.path_id, reason + " (RELEASE {})".format(wallet.instrument))
 
+    def snapshot(self) -> dict:
+        """The part of the order that changes as it is executed, which `restore` brings back."""
+        return {
+            "status": self.status,
+            "quantity": self.quantity,
+            "price": self.price,
+            "filled_size": self.filled_size,
+            "remaining_size": self.remaining_size,
+            "specs": list(self._specs),
+            "listeners": list(self._listeners),
+            "trades": list(self._trades)
+        }
+
+    def restore(self, state: dict):
+        self.status = state["status"]
+        self.quantity = state["quantity"]
+        self.price = state["price"]
+        self.filled_size = state["filled_size"]
+        self.remaining_size = state["remaining_size"]
+        self._specs = list(state["specs"])
+        self._listeners = list(state["listeners"])
+        self._trades = list(state["trades"])
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -13,6 +13,8 @@
 # limitations under the License
 
 
+import numpy as np
+
 from abc import abstractmethod
 
 from tensortrade import Component, TimeIndexed
@@ -26,6 +28,37 @@ class RewardScheme(Component, TimeIndexed):
         """Optionally implementable method for resetting stateful schemes."""
         pass
 
+    def get_rewards(self, portfolio: 'Portfolio', n: int) -> np.ndarray:
+        """Optionally implementable method computing the rewards of several steps at once.
+
+        By default, calls `get_reward` on the portfolio rewound to each of the steps
+        in turn. Schemes that can compute the rewards from the whole performance at
+        once should override it.
+
+        Arguments:
+            portfolio: The portfolio being used by the environment.
+            n: The number of steps, the last of which is the current step. No order
+                must have been filled over the steps.
+
+        Returns:
+            The reward `get_reward` would have returned at each of the last `n` steps.
+        """
+        rewards = np.zeros(n, dtype=np.float64)
+
+        for i in range(n):
+            with portfolio.rewound(n - 1 - i):
+                rewards[i] = self.get_reward(portfolio)
+
+        return rewards
+
+    def snapshot(self) -> any:
+        """Optionally implementable method for capturing the state of stateful schemes."""
+        return None
+
+    def restore(self, state: any):
+        """Optionally implementable method for restoring the state captured by `snapshot`."""
+        pass
+
     @abstractmethod
     def get_reward(self, portfolio: 'Portfolio') -> float:
         """
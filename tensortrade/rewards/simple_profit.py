@@ -13,6 +13,8 @@
 # limitations under the License
 
 
+import numpy as np
+
 from tensortrade.rewards import RewardScheme
 
 
@@ -37,3 +39,11 @@ class SimpleProfit(RewardScheme):
         returns = portfolio.performance['net_worth'].pct_change().dropna()
         returns = (1 + returns[-self.window_size:]).cumprod() - 1
         return 0 if len(returns) < 1 else returns.iloc[-1]
+
+    def get_rewards(self, portfolio: 'Portfolio', n: int) -> np.ndarray:
+        """The rewards of the last `n` timesteps, computed at once from the net worth."""
+        net_worth = portfolio.performance['net_worth'].values
+        steps = np.arange(len(net_worth) - n, len(net_worth))
+        start = np.maximum(steps - self.window_size, 0)
+
+        return net_worth[steps] / net_worth[start] - 1
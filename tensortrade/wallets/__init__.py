@@ -1,5 +1,6 @@
 from .portfolio import Portfolio
 from .wallet import Wallet
+from .wallet_listener import WalletListener
 
 
 _registry = {}
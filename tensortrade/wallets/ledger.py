@@ -33,5 +33,13 @@ class Ledger:
     def as_frame(self) -> pd.DataFrame:
         return pd.DataFrame(self.transactions)
 
+    def snapshot(self) -> int:
+        """The number of transactions committed so far."""
+        return len(self._transactions)
+
+    def restore(self, n_transactions: int):
+        """Forgets the transactions committed after `snapshot` returned `n_transactions`."""
+        del self._transactions[n_transactions:]
+
     def reset(self):
         self._transactions = []
\ No newline at end of file
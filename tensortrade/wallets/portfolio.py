@@ -13,17 +13,22 @@
 # limitations under the License
 
 import re
+import numpy as np
 import pandas as pd
 
+from contextlib import contextmanager
 from typing import Callable, Tuple, Union, List
 
 from tensortrade import Component, TimedIdentifiable
 from tensortrade.instruments import Instrument, Quantity, TradingPair
 from tensortrade.data.stream.listeners import FeedListener
 
+from .ledger import Ledger
 from .wallet import Wallet
 
 
+PRICE_PATTERN = re.compile("\\w+:/([A-Z]{3,4}).([A-Z]{3,4})")
+
 WalletType = Union['Wallet', Tuple['Exchange', Instrument, float]]
 
 
@@ -45,6 +50,7 @@ class Portfolio(Component, TimedIdentifiable, FeedListener):
         self._order_listener = self.default('order_listener', order_listener)
         self._performance_listener = self.default('performance_listener', performance_listener)
         self._wallets = {}
+        self._ledger = Ledger()
 
         for wallet in wallets:
             self.add(wallet)
@@ -96,7 +102,8 @@ class Portfolio(Component, TimedIdentifiable, FeedListener):
 
     @property
     def ledger(self) -> 'Ledger':
-        return Wallet.ledger
+        """The transactions of the wallets of this portfolio, kept apart from those of other portfolios."""
+        return self._ledger
 
     @property
     def exchange_pairs(self) -> List['Exchange']:
@@ -204,6 +211,7 @@ class Portfolio(Component, TimedIdentifiable, FeedListener):
         if isinstance(wallet, tuple):
             wallet = Wallet.from_tuple(wallet)
 
+        wallet.ledger = self._ledger
         self._wallets[(wallet.exchange.id, wallet.instrument.symbol)] = wallet
 
     def remove(self, wallet: 'Wallet'):
@@ -214,7 +222,6 @@ class Portfolio(Component, TimedIdentifiable, FeedListener):
 
     @staticmethod
     def find_keys(data: dict):
-        price_pattern = re.compile("\\w+:/([A-Z]{3,4}).([A-Z]{3,4})")
         endings = [
             ":/free",
             ":/locked",
@@ -227,11 +234,15 @@ class Portfolio(Component, TimedIdentifiable, FeedListener):
         for k in data.keys():
             if any(k.endswith(end) for end in endings):
                 keys += [k]
-            elif price_pattern.match(k):
+            elif PRICE_PATTERN.match(k):
                 keys += [k]
 
         return keys
 
+    def required_outputs(self, keys: List[str]) -> List[str]:
+        """The net worth and the exchange prices, which are also read by the exchanges."""
+        return ['net_worth'] + [k for k in keys if PRICE_PATTERN.match(k)]
+
     def on_next(self, data: dict):
         if not self._keys:
             self._keys = self.find_keys(data)
@@ -254,6 +265,78 @@ class Portfolio(Component, TimedIdentifiable, FeedListener):
         if self._performance_listener:
             self._performance_listener(performance_step)
 
+    def on_next_many(self, data: np.ndarray, keys: List[str]):
+        if not self._keys:
+            self._keys = self.find_keys(dict.fromkeys(keys))
+
+        index = pd.RangeIndex(self.clock.step, self.clock.step + len(data), name="step")
+        block = pd.DataFrame(data, columns=keys, index=index)
+
+        performance_block = block[self._keys].copy()
+        performance_block['base_symbol'] = self.base_instrument.symbol
+
+        net_worth = block['net_worth'].iloc[-1]
+
+        if self._performance is None:
+            self._performance = performance_block
+            self._initial_net_worth = block['net_worth'].iloc[0]
+        else:
+            self._performance = self._performance.append(performance_block)
+
+        self._net_worth = net_worth
+
+        if self._performance_listener:
+            self._performance_listener(performance_block)
+
+    def snapshot(self) -> dict:
+        """Captures the balances of every wallet and the performance of the portfolio.
+
+        The performance frame is replaced, never modified, when the portfolio is
+        updated, so the state keeps a reference to it instead of a copy.
+        """
+        return {
+            'wallets': {key: wallet.snapshot() for key, wallet in self._wallets.items()},
+            'ledger': self.ledger.snapshot(),
+            'initial_balance': self._initial_balance,
+            'initial_net_worth': self._initial_net_worth,
+            'net_worth': self._net_worth,
+            'performance': self._performance,
+            'keys': self._keys
+        }
+
+    def restore(self, state: dict):
+        """Brings the portfolio back to the state captured by `snapshot`."""
+        for key, wallet_state in state['wallets'].items():
+            self._wallets[key].restore(wallet_state)
+
+        self.ledger.restore(state['ledger'])
+        self._initial_balance = state['initial_balance']
+        self._initial_net_worth = state['initial_net_worth']
+        self._net_worth = state['net_worth']
+        self._performance = state['performance']
+        self._keys = state['keys']
+
+    @contextmanager
+    def rewound(self, n: int):
+        """Presents the performance and the net worth of the portfolio as they were `n` timesteps ago.
+
+        The balances of the wallets are left as they are, so this only describes the
+        past timesteps over which no order was filled.
+
+        Arguments:
+            n: The number of timesteps to go back, fewer than the length of the performance.
+        """
+        performance, net_worth = self._performance, self._net_worth
+
+        if n > 0:
+            self._performance = performance.iloc[:-n]
+            self._net_worth = self._performance['net_worth'].iloc[-1]
+
+        try:
+            yield self
+        finally:
+            self._performance, self._net_worth = performance, net_worth
+
     def reset(self):
         self._initial_balance = self.base_balance
         self._initial_net_worth = None
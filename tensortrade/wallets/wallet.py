@@ -12,27 +12,56 @@
 # See the License for the specific language governing permissions and
 # limitations under the License
 
-from typing import Dict, Tuple
+import weakref
+
+from typing import Dict, List, Tuple
 
 from tensortrade.base import Identifiable
+from tensortrade.base.core import Observable
 from tensortrade.base.exceptions import InsufficientFunds
 from tensortrade.instruments import Quantity
 
 from .ledger import Ledger, Transaction
 
 
-class Wallet(Identifiable):
-    """A wallet stores the balance of a specific instrument on a specific exchange."""
+class Wallet(Identifiable, Observable):
+    """A wallet stores the balance of a specific instrument on a specific exchange.
+
+    Attached `WalletListener`s are notified through `on_change` every time the wallet
+    commits a transaction to the ledger or is reset. Listeners are held weakly, so
+    the nodes of a feed built over the wallet stop listening once the feed is gone.
+    Wallets commit to the shared `Wallet.ledger` until they are added to a
+    `Portfolio`, which gives them its own.
+    """
 
     ledger = Ledger()
 
     def __init__(self, exchange: 'Exchange', quantity: 'Quantity'):
+        super().__init__()
+
         self._exchange = exchange
         self._initial_size = quantity.size
         self._instrument = quantity.instrument
         self._balance = quantity
         self._locked = {}
 
+    @property
+    def listeners(self) -> List['WalletListener']:
+        """The attached listeners that are still alive."""
+        listeners = [ref() for ref in self._listeners]
+
+        if None in listeners:
+            self._listeners = [ref for ref, listener in zip(self._listeners, listeners) if listener is not None]
+            listeners = [listener for listener in listeners if listener is not None]
+
+        return listeners
+
+    def attach(self, listener: 'WalletListener'):
+        self._listeners += [weakref.ref(listener)]
+
+    def detach(self, listener: 'WalletListener'):
+        self._listeners = [ref for ref in self._listeners if ref() is not listener]
+
     @classmethod
     def from_tuple(cls, wallet_tuple: Tuple['Exchange', 'Instrument', float]):
         exchange, instrument, balance = wallet_tuple
@@ -62,6 +91,7 @@ class Wallet(Identifiable):
     @balance.setter
     def balance(self, balance: 'Quantity'):
         self._balance = balance
+        self._notify()
 
     @property
     def locked_balance(self) -> 'Quantity':
@@ -114,6 +144,7 @@ class Wallet(Identifiable):
             self.balance,
             self.locked_balance
         ))
+        self._notify()
         return self
 
     def __isub__(self, quantity: 'Quantity') -> 'Wallet':
@@ -137,11 +168,28 @@ class Wallet(Identifiable):
             self.balance,
             self.locked_balance
         ))
+        self._notify()
         return self
 
+    def _notify(self):
+        for listener in self.listeners:
+            listener.on_change(self)
+
+    def snapshot(self) -> tuple:
+        """The free and locked balances of the wallet, which `restore` brings back."""
+        return self._balance, dict(self._locked)
+
+    def restore(self, state: tuple):
+        balance, locked = state
+
+        self._balance = balance
+        self._locked = dict(locked)
+        self._notify()
+
     def reset(self):
         self._balance = Quantity(self._instrument, self._initial_size)
         self._locked = {}
+        self._notify()
 
     def __str__(self):
         return '<Wallet: balance={}, locked={}>'.format(self.balance, self.locked_balance)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+
+from tensortrade.agents import ParallelDQNAgent
+from tensortrade.agents.parallel import ParallelDQNModel
+from tensortrade.environments import TradingEnvironment
+from tensortrade.exchanges import Exchange
+from tensortrade.exchanges.services.execution.simulated import execute_order
+from tensortrade.instruments import USD, BTC
+from tensortrade.rewards import SimpleProfit
+from tensortrade.wallets import Portfolio, Wallet
+from tensortrade.actions import ManagedRiskOrders
+from tensortrade.data import DataFeed, Stream, Module
+
+
+def create_env():
+    close = list(np.linspace(100, 200, 50))
+    coinbase = Exchange("coinbase", service=execute_order)(Stream("USD-BTC", close))
+
+    with Module("coinbase") as features:
+        Stream("volume", list(range(50)))
+
+    return TradingEnvironment(
+        portfolio=Portfolio(USD, [Wallet(coinbase, 10000 * USD), Wallet(coinbase, 10 * BTC)]),
+        action_scheme=ManagedRiskOrders(),
+        reward_scheme=SimpleProfit(),
+        feed=DataFeed([features]),
+        window_size=8,
+        normalizer=True,
+        enable_logger=False
+    )
+
+
+def create_agent():
+    network = tf.keras.Sequential([
+        tf.keras.layers.InputLayer(input_shape=(8, 12)),
+        tf.keras.layers.Flatten(),
+        tf.keras.layers.Dense(181, activation="softmax")
+    ])
+
+    return ParallelDQNAgent(create_env, model=ParallelDQNModel(create_env, policy_network=network))
+
+
+def test_save_and_restore_normalizer(tmp_path):
+    agent = create_agent()
+
+    agent.env.reset()
+    for _ in range(10):
+        agent.env.step(0)
+
+    normalizer = agent.env.normalizer
+    assert normalizer.count > 0
+
+    path = str(tmp_path) + "/"
+    agent.save(path)
+
+    restored = create_agent()
+    restored.restore(path + "policy_network__" + agent.id + ".hdf5")
+
+    assert restored.env.normalizer.count == normalizer.count
+    np.testing.assert_allclose(restored.env.normalizer.mean, normalizer.mean)
+    np.testing.assert_allclose(restored.env.normalizer.var, normalizer.var)
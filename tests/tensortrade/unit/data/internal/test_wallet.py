@@ -7,7 +7,7 @@ from tensortrade.instruments import Quantity, USD, BTC
 
 from tensortrade.exchanges.services.execution.simulated import execute_order
 from tensortrade.exchanges import Exchange
-from tensortrade.data.internal import create_wallet_source
+from tensortrade.data.internal import create_wallet_source, WalletLambda
 from tensortrade.data import DataFeed, Stream, Reduce
 
 
@@ -48,3 +48,64 @@ def test_exchange_with_wallets_feed():
         "binance:/USD:/locked": 400,
         "binance:/USD:/total": 1000
     }
+
+
+def test_wallet_nodes_only_update_on_change():
+
+    ex = Exchange("coinbase", service=execute_order)(
+        Stream("USD-BTC", [7000, 7500, 8300, 8000])
+    )
+
+    wallet = Wallet(ex, 10 * BTC)
+    calls = []
+
+    def extract(w):
+        calls.append(w)
+        return w.balance.size
+
+    free = WalletLambda("free", extract, wallet)
+    feed = DataFeed([free])
+
+    assert feed.next() == {"free": 10}
+    assert feed.next() == {"free": 10}
+    assert len(calls) == 1
+
+    wallet -= 4 * BTC
+
+    assert feed.next() == {"free": 6}
+    assert len(calls) == 2
+
+    wallet.reset()
+
+    assert feed.next() == {"free": 10}
+    assert len(calls) == 3
+
+
+def test_rebuilt_feeds_do_not_accumulate_wallet_listeners():
+    import gc
+
+    ex = Exchange("coinbase", service=execute_order)(
+        Stream("USD-BTC", [7000, 7500, 8300, 8000])
+    )
+
+    wallet = Wallet(ex, 10 * BTC)
+
+    first = DataFeed([create_wallet_source(wallet, include_worth=False)])
+    first.next()
+    assert len(wallet.listeners) == 4
+
+    second = DataFeed([create_wallet_source(wallet, include_worth=False)])
+    assert len(wallet.listeners) == 8
+
+    del first
+    gc.collect()
+
+    assert len(wallet.listeners) == 4
+
+    wallet -= 4 * BTC
+    assert second.next() == {
+        "coinbase:/BTC:/free": 6,
+        "coinbase:/BTC:/locked": 0,
+        "coinbase:/BTC:/total": 6,
+        "coinbase:/BTC:/is_empty": 1
+    }
@@ -1,8 +1,9 @@
 
 import operator
+import numpy as np
 import pytest
 
-from tensortrade.data import DataFeed, Stream
+from tensortrade.data import DataFeed, Stream, Lambda, FeedListener
 from tensortrade.data.stream.transform import BinOp
 
 
@@ -47,3 +48,383 @@ def test_multi_step_adding():
 
     output = feed.next()
     assert output == {'a1': 1, 'a2': 4, 't2': 9}
+
+
+def test_columnar_matches_eager():
+
+    def build(columnar):
+        a1 = Stream('a1', [1, 2, 3, 4])
+        a2 = Stream('a2', [4, 5, 6])
+
+        t1 = BinOp('t1', operator.add)(a1, a2)
+        t2 = BinOp('t2', lambda x, y: max(x, y))(t1, a1)
+
+        return DataFeed([a1, a2, t1, t2], columnar=columnar)
+
+    eager = build(False)
+    columnar = build(True)
+
+    while eager.has_next():
+        assert columnar.has_next()
+        assert columnar.next() == eager.next()
+
+    assert not columnar.has_next()
+
+    columnar.reset()
+    assert columnar.next() == {'a1': 1, 'a2': 4, 't1': 5, 't2': 5}
+
+
+def test_columnar_evaluates_lambdas_live():
+    state = {'x': 1}
+
+    a1 = Stream('a1', [1, 2, 3])
+    x = Lambda('x', lambda s: s['x'], state)
+    t1 = BinOp('t1', operator.mul)(a1, x)
+
+    feed = DataFeed([a1, t1], columnar=True)
+    feed.compile()
+
+    assert feed.process == [x, t1]
+    assert feed.next() == {'a1': 1, 't1': 1}
+
+    state['x'] = 10
+    assert feed.next() == {'a1': 2, 't1': 20}
+
+
+def test_toposort_orders_inputs_first():
+    a1 = Stream('a1', [1, 2, 3])
+    a2 = Stream('a2', [4, 5, 6])
+
+    t1 = BinOp('t1', operator.add)(a1, a2)
+    t2 = BinOp('t2', operator.add)(t1, a1)
+
+    feed = DataFeed([t2, a2])
+    process = feed.toposort(feed.gather())
+
+    assert set(process) == {a1, a2, t1, t2}
+    assert process.index(a1) < process.index(t1) < process.index(t2)
+    assert process.index(a2) < process.index(t1)
+
+
+def test_compile_deep_graph():
+    node = Stream('a0', [1, 2, 3])
+    for i in range(10000):
+        node = BinOp('a' + str(i + 1), operator.add)(node, node)
+
+    feed = DataFeed([node])
+    feed.compile()
+
+    assert len(feed.process) == 10001
+
+    other = DataFeed([node])
+    other.compile()
+
+    assert other.process == feed.process
+    assert other.next() == {'a10000': 2 ** 10000}
+
+
+def test_next_many_matches_next():
+
+    def build(columnar):
+        state = {'x': 2}
+
+        a1 = Stream('a1', [1, 2, 3, 4, 5])
+        a2 = Stream('a2', [4, 5, 6, 7, 8])
+        x = Lambda('x', lambda s: s['x'], state)
+
+        t1 = BinOp('t1', operator.add)(a1, a2)
+        t2 = BinOp('t2', operator.mul)(t1, x)
+
+        return DataFeed([a1, t1, t2], columnar=columnar)
+
+    expected = build(False)
+    rows = [list(expected.next().values()) for _ in range(5)]
+
+    for columnar in [False, True]:
+        feed = build(columnar)
+
+        assert feed.keys == ['a1', 't1', 't2']
+
+        block = feed.next_many(3)
+        assert block.shape == (3, 3)
+        assert block.tolist() == rows[:3]
+
+        block = feed.next_many(3)
+        assert block.tolist() == rows[3:]
+        assert not feed.has_next()
+
+
+def test_next_many_allocates_only_rows_left():
+    state = {'x': 2}
+
+    for columnar, live in [(True, False), (True, True), (False, True)]:
+        nodes = [Stream('a', [1, 2, 3, 4, 5])]
+        if live:
+            nodes += [Lambda('x', lambda s: s['x'], state)]
+
+        feed = DataFeed(nodes, columnar=columnar)
+        feed.chunk_size = 2
+        feed.next()
+
+        block = feed.next_many(10 ** 12)
+
+        assert block[:, 0].tolist() == [2, 3, 4, 5]
+        assert not feed.has_next()
+        assert feed.next_many(10 ** 12).shape == (0, len(nodes))
+
+
+def test_iter_blocks_notifies_listeners():
+
+    class Recorder(FeedListener):
+
+        def __init__(self):
+            self.rows = []
+
+        def on_next(self, data):
+            self.rows += [data]
+
+    recorder = Recorder()
+
+    a1 = Stream('a1', [1, 2, 3, 4, 5])
+    feed = DataFeed([a1], columnar=True)
+    feed.attach(recorder)
+
+    blocks = list(feed.iter_blocks(2))
+
+    assert [len(block) for block in blocks] == [2, 2, 1]
+    assert recorder.rows == [{'a1': v} for v in [1, 2, 3, 4, 5]]
+
+
+def test_next_array_schema():
+    a1 = Stream('a1', [1, 2, 3])
+    a2 = Stream('a2', [4, 5, 6])
+    t1 = BinOp('t1', operator.add)(a1, a2)
+
+    for columnar in [False, True]:
+        feed = DataFeed([a1, a2, t1], columnar=columnar)
+        feed.compile(outputs=['t1', 'a1'])
+
+        assert feed.schema.names == ['t1', 'a1']
+        assert feed.schema.dtype == np.float32
+
+        vector = feed.next_array()
+        assert vector.dtype == np.float32
+        assert vector.tolist() == [5, 1]
+
+        assert feed.next_array() is vector
+        assert vector.tolist() == [7, 2]
+
+
+def test_next_array_unknown_output():
+    feed = DataFeed([Stream('a1', [1, 2, 3])])
+
+    with pytest.raises(KeyError):
+        feed.compile(outputs=['a2'])
+
+
+def test_compile_prunes_unused_nodes():
+
+    class NeedsA2(FeedListener):
+
+        def required_outputs(self, keys):
+            return ['a2']
+
+    a1 = Stream('a1', [1, 2, 3])
+    a2 = Stream('a2', [4, 5, 6])
+    a3 = Stream('a3', [7, 8, 9])
+
+    t1 = BinOp('t1', operator.add)(a1, a2)
+    t2 = BinOp('t2', operator.mul)(a3, a3)
+
+    feed = DataFeed([a1, a2, a3, t1, t2])
+    feed.compile(outputs=['t1'])
+
+    assert set(feed.pruned) == {a3, t2}
+    assert set(feed.process) == {a1, a2, t1}
+    assert feed.next() == {'a1': 1, 'a2': 4, 't1': 5}
+    assert "2 pruned" in feed.summary()
+
+    feed = DataFeed([a1, a2, a3, t1, t2])
+    feed.attach(NeedsA2())
+    feed.compile(outputs=['t2'])
+
+    assert set(feed.pruned) == {a1, t1}
+    assert feed.next_array().tolist() == [49]
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_snapshot_and_restore(columnar):
+    from tensortrade.data.stream.indicators import EMA
+
+    a = Stream('a', [1., 2., 3., 4., 5., 6.])
+    ema = EMA('ema', span=3)(a)
+    live = Lambda('live', lambda x: x.value * 10, a)
+
+    feed = DataFeed([a, ema, live], columnar=columnar)
+
+    feed.next()
+    feed.next()
+
+    state = feed.snapshot()
+    expected = [feed.next() for _ in range(4)]
+    assert not feed.has_next()
+
+    for _ in range(2):
+        feed.restore(state)
+        assert feed.has_next()
+        assert [feed.next() for _ in range(4)] == expected
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_reset_to_start_offset(columnar):
+    a1 = Stream('a1', [1, 2, 3, 4, 5])
+    a2 = Stream('a2', [10, 20, 30, 40, 50])
+    t1 = BinOp('t1', operator.add)(a1, a2)
+
+    feed = DataFeed([a1, a2, t1], columnar=columnar)
+
+    feed.reset(start=3)
+    assert feed.next() == {'a1': 4, 'a2': 40, 't1': 44}
+    assert feed.next() == {'a1': 5, 'a2': 50, 't1': 55}
+    assert not feed.has_next()
+
+    feed.reset()
+    assert feed.next() == {'a1': 1, 'a2': 10, 't1': 11}
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_compile_merges_duplicate_nodes(columnar):
+    from tensortrade.data import ArrayStream, Select, Module
+    from tensortrade.data.stream.indicators import RollingMean
+
+    prices = np.array([1., 2., 3., 4.])
+
+    with Module("exchange") as exchange:
+        ArrayStream("price", prices)
+
+    def build(name):
+        price = Select("exchange:/price")(exchange)
+        sma = RollingMean(name + "-sma", 2)(price)
+        return DataFeed([BinOp(name, operator.mul)(sma, price)])
+
+    feed = build("a") + build("b")
+    feed.columnar = columnar
+    feed.compile()
+
+    assert len(feed.deduplicated) == 3
+    assert "3 deduplicated" in feed.summary()
+
+    feed.next()
+    assert feed.next() == {'a': 3., 'b': 3.}
+
+    unoptimized = build("a") + build("b")
+    unoptimized.compile(optimize=False)
+
+    assert unoptimized.deduplicated == []
+
+
+def test_compile_does_not_rewire_nodes_shared_with_other_feeds():
+    from tensortrade.data import ArrayStream
+    from tensortrade.data.stream.indicators import RollingMean
+
+    price = ArrayStream("price", np.array([1., 2., 3.]))
+    m1 = RollingMean("m1", 2)(price)
+    m2 = RollingMean("m2", 2)(price)
+    shared = BinOp("shared", operator.add)(m2, price)
+
+    first = DataFeed([m1, shared])
+    first.compile()
+
+    assert shared.inputs[0] is m2
+    assert m2 in first.process
+    assert first.deduplicated == []
+
+    second = DataFeed([shared])
+    second.compile()
+
+    assert m1 not in DataFeed.ancestors(second.process)
+
+    second.next()
+    assert second.next() == {'shared': 3.5}
+
+    first.reset()
+    first.next()
+    assert first.next() == {'m1': 1.5, 'shared': 3.5}
+
+
+def test_compile_keeps_forwarded_nodes():
+    from tensortrade.data import Forward
+
+    a = Stream('a', [1, 2, 3])
+    f1 = Forward(a)
+    f2 = Forward(a)
+
+    feed = DataFeed([BinOp('sum', operator.add)(f1, f2)])
+    feed.next()
+
+    assert feed.deduplicated == []
+    assert f1.value == f2.value == 1
+
+
+def test_plan_cache_does_not_keep_graphs_alive():
+    import gc
+    import weakref
+
+    a = Stream('a', [1, 2, 3])
+    t = BinOp('t', operator.add)(a, a)
+    first = DataFeed([t])
+    first.compile()
+
+    second = DataFeed([t])
+    second.compile()
+    assert [n.name for n in second.process] == [n.name for n in first.process]
+    assert second.process[-1] is t
+
+    ref = weakref.ref(t)
+    del a, t, first, second
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_plan_is_reused_until_the_graph_changes():
+    a = Stream('a', [1, 2, 3])
+    t = BinOp('t', operator.add)(a, a)
+    feed = DataFeed([t])
+
+    feed.compile()
+    plan, index = feed._plan, feed.index
+
+    feed.compile()
+    assert feed._plan is plan
+    assert feed.index is index
+
+    u = BinOp('u', operator.mul)(t, a)
+    feed(t, u)
+    feed.compile()
+
+    assert feed._plan is not plan
+    assert feed.process[-1] is u
+    assert feed.next() == {'t': 2, 'u': 2}
+
+def test_plans_from_several_threads():
+    import threading
+
+    errors = []
+
+    def build():
+        try:
+            for _ in range(50):
+                a = Stream('a', [1, 2, 3])
+                feed = DataFeed([BinOp('t', operator.add)(a, a)])
+                assert feed.next() == {'t': 2}
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=build) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
@@ -0,0 +1,74 @@
+
+import operator
+
+import pytest
+
+from tensortrade.data import DataFeed, Stream, Module, Select, BinOp, Condition, Reduce, NameIndex, NameMatch
+
+
+def make_nodes():
+    with Module("coinbase") as coinbase:
+        usd_btc = Stream("USD-BTC", [1, 2])
+        usd_eth = Stream("USD-ETH", [3, 4])
+        btc_eth = Stream("BTC-ETH", [5, 6])
+
+    return coinbase, [usd_btc, usd_eth, btc_eth]
+
+
+def test_exact_and_suffix_lookups():
+    _, nodes = make_nodes()
+    index = NameIndex(nodes)
+
+    assert index.exact("coinbase:/USD-ETH") == [nodes[1]]
+    assert index.exact("USD-ETH") == []
+    assert index.suffix("ETH") == [nodes[1], nodes[2]]
+    assert index.suffix("BTC") == [nodes[0]]
+    assert index.suffix("XRP") == []
+
+
+def test_pattern_lookups_are_cached():
+    _, nodes = make_nodes()
+    index = NameIndex(nodes)
+
+    assert index.pattern("USD-") == [nodes[0], nodes[1]]
+    assert "USD-" in index._patterns
+    assert index.pattern("^coinbase:/BTC") == [nodes[2]]
+
+
+def test_matches_are_predicates():
+    _, nodes = make_nodes()
+    match = NameMatch.suffix("BTC") | NameMatch.exact("coinbase:/BTC-ETH")
+
+    assert list(filter(match, nodes)) == [nodes[0], nodes[2]]
+    assert match.lookup(NameIndex(nodes)) == [nodes[0], nodes[2]]
+
+
+def test_select_resolves_through_feed_index():
+    coinbase, nodes = make_nodes()
+
+    eth = Select(NameMatch.suffix("ETH"))(coinbase)
+    doubled = BinOp("doubled", operator.add)(eth, eth)
+
+    feed = DataFeed([doubled])
+
+    assert feed.next() == {"doubled": 6}
+    assert eth.name == "coinbase:/USD-ETH"
+    assert feed.index.exact("coinbase:/BTC-ETH") == [nodes[2]]
+
+
+def test_select_without_match_raises():
+    coinbase, _ = make_nodes()
+
+    select = Select(NameMatch.suffix("XRP"))(coinbase)
+
+    with pytest.raises(KeyError):
+        DataFeed([select]).compile()
+
+
+def test_condition_with_match():
+    coinbase, _ = make_nodes()
+
+    eths = Condition("eths", NameMatch.suffix("ETH"))(coinbase)
+    total = Reduce("total", operator.add)(eths)
+
+    assert DataFeed([total]).next() == {"total": 8}
@@ -0,0 +1,132 @@
+
+import numpy as np
+import pandas as pd
+
+from tensortrade.data import DataFeed, Stream
+from tensortrade.data.stream.indicators import RollingMean, RollingStd, RollingMin, RollingMax, EMA, RSI, \
+    macd, bollinger_bands
+
+
+prices = list(100 + np.cumsum(np.random.RandomState(0).normal(size=60)))
+
+
+def run(node, columnar=False):
+    feed = DataFeed([node], columnar=columnar)
+    values = []
+    while feed.has_next():
+        values += [feed.next()[node.name]]
+    return np.array(values)
+
+
+def test_rolling_mean():
+    node = RollingMean("sma", 5)(Stream("price", prices))
+    expected = pd.Series(prices).rolling(5).mean().values
+
+    np.testing.assert_allclose(run(node), expected)
+
+
+def test_rolling_std():
+    node = RollingStd("std", 7)(Stream("price", prices))
+    expected = pd.Series(prices).rolling(7).std(ddof=0).values
+
+    np.testing.assert_allclose(run(node), expected)
+
+
+def test_rolling_min_max():
+    price = Stream("price", prices)
+
+    np.testing.assert_allclose(run(RollingMax("max", 4)(price)), pd.Series(prices).rolling(4).max().values)
+    np.testing.assert_allclose(run(RollingMin("min", 4)(price)), pd.Series(prices).rolling(4).min().values)
+
+
+def test_ema():
+    node = EMA("ema", span=10)(Stream("price", prices))
+    expected = pd.Series(prices).ewm(span=10, adjust=False).mean().values
+
+    np.testing.assert_allclose(run(node), expected)
+
+
+def test_rsi():
+    node = RSI("rsi", 14)(Stream("price", prices))
+
+    diff = pd.Series(prices).diff()
+    gain = diff.clip(lower=0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    loss = (-diff).clip(lower=0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    expected = (100 - 100 / (1 + gain / loss)).values
+
+    np.testing.assert_allclose(run(node), expected)
+
+
+def test_reset():
+    node = RollingMean("sma", 3)(Stream("price", prices))
+    feed = DataFeed([node])
+
+    first = [feed.next()["sma"] for _ in range(5)]
+    feed.reset()
+    second = [feed.next()["sma"] for _ in range(5)]
+
+    np.testing.assert_allclose(first, second)
+
+
+def test_columnar_matches_eager():
+    node = RollingStd("std", 7)(Stream("price", prices))
+
+    np.testing.assert_allclose(run(node, columnar=True), run(node))
+
+
+def test_macd_and_bollinger_bands():
+    price = Stream("price", prices)
+
+    feed = DataFeed([macd(price), bollinger_bands(price)])
+    data = feed.next()
+
+    assert set(data.keys()) == {
+        "macd:/macd", "macd:/signal", "macd:/histogram",
+        "bb:/mid", "bb:/upper", "bb:/lower"
+    }
+
+    for _ in range(30):
+        data = feed.next()
+
+    series = pd.Series(prices[:31])
+    line = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+
+    np.testing.assert_allclose(data["macd:/macd"], line.iloc[-1])
+    np.testing.assert_allclose(data["bb:/upper"], series.rolling(20).mean().iloc[-1] + 2 * series.rolling(20).std(ddof=0).iloc[-1])
+
+
+gappy = [1, 2, np.nan, 4, 5, 6, 7, 8, np.nan, np.nan, 11, 12, 11, 14]
+
+
+def test_rolling_indicators_recover_from_missing_values():
+    series = pd.Series(gappy)
+    rolling = series.rolling(2)
+
+    np.testing.assert_allclose(run(RollingMean("sma", 2)(Stream("x", gappy))), rolling.mean().values)
+    np.testing.assert_allclose(run(RollingStd("std", 2)(Stream("x", gappy))), rolling.std(ddof=0).values)
+    np.testing.assert_allclose(run(RollingMax("max", 2)(Stream("x", gappy))), rolling.max().values)
+    np.testing.assert_allclose(run(RollingMin("min", 2)(Stream("x", gappy))), rolling.min().values)
+
+
+def test_ema_with_missing_values():
+    node = EMA("ema", span=3)(Stream("x", [np.nan] + gappy))
+    expected = pd.Series([np.nan] + gappy).ewm(span=3, adjust=False).mean().values
+
+    np.testing.assert_allclose(run(node), expected)
+
+
+def test_rsi_skips_missing_values():
+    values = run(RSI("rsi", 3)(Stream("x", gappy)))
+    clean = run(RSI("rsi", 3)(Stream("x", [v for v in gappy if not np.isnan(v)])))
+
+    assert np.isnan(values[np.isnan(gappy)]).all()
+    np.testing.assert_allclose(values[~np.isnan(gappy)], clean)
+
+
+def test_rolling_indicators_with_large_magnitudes():
+    values = [1e16, 1, 1, 1, 1, 1, 2, 3]
+    rolling = pd.Series(values).rolling(3)
+
+    np.testing.assert_allclose(run(RollingMean("sma", 3)(Stream("x", values)))[3:], rolling.mean().values[3:])
+    np.testing.assert_allclose(run(RollingStd("std", 3)(Stream("x", values)))[3:],
+                               rolling.std(ddof=0).values[3:], atol=1e-12)
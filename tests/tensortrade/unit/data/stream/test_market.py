@@ -0,0 +1,59 @@
+
+import operator
+
+import numpy as np
+import pytest
+
+from tensortrade.data import DataFeed, Stream, BinOp, Lambda, MarketData
+from tensortrade.data.stream.indicators import RollingMean
+
+
+@pytest.fixture
+def market():
+    price = Stream("price", [1., 2., 3., 4., 5.])
+    sma = RollingMean("sma", 2)(price)
+    spread = BinOp("spread", operator.sub)(price, sma)
+
+    return MarketData([price, sma, spread])
+
+
+def test_history_is_computed_once(market):
+    assert len(market) == 5
+    assert market.names == ["price", "sma", "spread"]
+    np.testing.assert_allclose(market.values[:, 1], [np.nan, 1.5, 2.5, 3.5, 4.5])
+    assert not market.values.flags.writeable
+
+
+def test_feeds_share_history(market):
+    f1 = market.feed()
+    f2 = market.feed({"price": "close"})
+
+    f1.compile()
+    f2.compile()
+
+    assert np.shares_memory(f1._static.values, market.values)
+    assert np.shares_memory(f2._static.values, market.values)
+
+    f1.next()
+    assert f1.next() == {"price": 2., "sma": 1.5, "spread": 0.5}
+    assert f2.next() == {"close": 1.}
+
+
+def test_live_nodes_read_shared_history(market):
+    state = {"units": 2.}
+    price = market.streams(["price"])[0]
+
+    worth = BinOp("worth", operator.mul)(price, Lambda("units", lambda s: s["units"], state))
+    feed = DataFeed([worth], columnar=True)
+    feed.compile()
+
+    assert np.shares_memory(feed._static.values, market.values)
+    assert feed.next() == {"worth": 2.}
+
+    state["units"] = 3.
+    assert feed.next() == {"worth": 6.}
+
+
+def test_unknown_columns_raise(market):
+    with pytest.raises(KeyError):
+        market.streams(["volume"])
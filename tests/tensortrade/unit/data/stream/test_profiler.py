@@ -0,0 +1,91 @@
+
+import operator
+import tracemalloc
+
+from tensortrade.data import DataFeed, Stream, Module, BinOp, FeedProfiler
+
+
+def build():
+    with Module("exchange") as exchange:
+        a1 = Stream("a1", [1, 2, 3])
+        a2 = Stream("a2", [4, 5, 6])
+
+        BinOp("total", operator.add)(a1, a2)
+
+    return DataFeed([exchange])
+
+
+def test_profiler_records_nodes():
+    feed = build()
+    feed.profiler = FeedProfiler()
+
+    feed.next()
+    feed.next()
+
+    frame = feed.profiler.to_frame()
+
+    assert set(frame.index) == {"exchange:/a1", "exchange:/a2", "exchange:/total"}
+    assert (frame["calls"] == 2).all()
+    assert list(frame["total_time"]) == sorted(frame["total_time"], reverse=True)
+    assert "exchange:/total" in feed.profiler.report()
+
+
+def test_profiler_records_allocations():
+    feed = build()
+    feed.profiler = FeedProfiler(allocations=True)
+
+    feed.next()
+
+    assert "allocated" in feed.profiler.report()
+
+    feed.profiler.stop()
+
+
+def test_profiler_columnar_table():
+    feed = build()
+    feed.columnar = True
+    feed.profiler = FeedProfiler()
+
+    assert feed.next() == {"exchange:/a1": 1, "exchange:/a2": 4, "exchange:/total": 5}
+
+    frame = feed.profiler.to_frame()
+
+    assert list(frame.index) == [FeedProfiler.STATIC]
+    assert frame.loc[FeedProfiler.STATIC, "calls"] == 1
+
+
+def test_profiler_disabled():
+    feed = build()
+    profiler = FeedProfiler()
+    feed.profiler = profiler
+
+    feed.next()
+    feed.profiler = None
+    feed.next()
+
+    assert (profiler.to_frame()["calls"] == 1).all()
+
+
+def test_profiler_stops_the_tracing_it_started():
+    feed = build()
+    feed.profiler = FeedProfiler(allocations=True)
+
+    feed.next()
+    assert tracemalloc.is_tracing()
+
+    feed.profiler = None
+    assert not tracemalloc.is_tracing()
+
+
+def test_profiler_leaves_tracing_that_was_already_on():
+    tracemalloc.start()
+    try:
+        feed = build()
+        feed.profiler = FeedProfiler(allocations=True)
+
+        feed.next()
+        feed.profiler = None
+
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -1,6 +1,14 @@
 
 
-from tensortrade.data import Stream
+import operator
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tensortrade.data import Stream, ArrayStream, AsyncStream, DataFeed, BinOp
 
 
 def test_array_init():
@@ -31,3 +39,194 @@ def test_array_reset():
     assert array_ds.forward() == 1
     assert array_ds.forward() == 2
     assert array_ds.forward() == 3
+
+
+def test_array_stream_from_array():
+
+    array = np.arange(6, dtype=np.float64).reshape(3, 2)
+    a, b = ArrayStream.from_array(array, ['a', 'b'])
+
+    assert np.shares_memory(a.array, array)
+    assert np.shares_memory(b.array, array)
+
+    assert a.forward() == 0
+    assert b.forward() == 1
+    assert a.forward() == 2
+
+    a.reset()
+    assert a.forward() == 0
+    assert a.has_next()
+
+
+def test_array_stream_from_frame():
+
+    frame = pd.DataFrame({'open': [1.0, 2.0], 'close': [3.0, 4.0]})
+    streams = ArrayStream.from_frame(frame)
+
+    assert [s.name for s in streams] == ['open', 'close']
+    assert np.array_equal(streams[1].array, [3.0, 4.0])
+
+    close = ArrayStream('close', frame['close'])
+    assert close.forward() == 3.0
+
+
+def test_non_numeric_array_streams_stay_live_in_columnar_feeds():
+
+    frame = pd.DataFrame({'date': ['2020-01-01', '2020-01-02'], 'close': [3.0, 4.0]})
+    date, close = ArrayStream.from_frame(frame)
+    label = ArrayStream('label', np.array(['up', 'down']))
+
+    feed = DataFeed([date, close, label, ArrayStream('open', frame['close'])], columnar=True)
+
+    assert feed.next() == {'date': '2020-01-01', 'close': 3.0, 'label': 'up', 'open': 3.0}
+    assert feed.next() == {'date': '2020-01-02', 'close': 4.0, 'label': 'down', 'open': 4.0}
+
+
+def test_array_stream_from_memmap(tmp_path):
+
+    path = str(tmp_path / "data.bin")
+    np.arange(8, dtype=np.float32).tofile(path)
+
+    streams = ArrayStream.from_memmap(path, ['a', 'b'], dtype=np.float32)
+
+    assert isinstance(streams[0].array.base, np.memmap)
+
+    feed = DataFeed(streams, columnar=True)
+    assert feed.next() == {'a': 0, 'b': 1}
+    assert feed.next() == {'a': 2, 'b': 3}
+
+
+def fake_producer(values, delay=0.):
+    def produce():
+        for v in values:
+            if delay:
+                time.sleep(delay)
+            yield v
+    return produce
+
+
+def test_async_stream_contract():
+    s = AsyncStream('a', fake_producer([1, 2, 3]), buffer_size=2)
+
+    values = []
+    while s.has_next():
+        values += [s.forward()]
+
+    assert values == [1, 2, 3]
+
+    s.reset()
+    assert s.has_next()
+    assert s.forward() == 1
+    s.close()
+
+
+def test_async_stream_in_feed():
+    a = AsyncStream('a', fake_producer([1., 2., 3.]))
+    b = Stream('b', [10., 20., 30., 40.])
+    c = BinOp('c', operator.add)(a, b)
+
+    feed = DataFeed([a, b, c], columnar=True)
+
+    rows = []
+    while feed.has_next():
+        rows += [feed.next()['c']]
+
+    assert rows == [11., 22., 33.]
+
+    feed.reset()
+    assert feed.next()['c'] == 11.
+
+
+def test_async_stream_async_producer():
+    async def produce():
+        for v in [1, 2, 3]:
+            yield v
+
+    s = AsyncStream('a', produce)
+
+    values = []
+    while s.has_next():
+        values += [s.forward()]
+
+    assert values == [1, 2, 3]
+
+
+def test_async_stream_prefetches():
+    s = AsyncStream('a', fake_producer(range(10)), buffer_size=4)
+    s.start()
+
+    deadline = time.time() + 5
+    while s.buffered < 4 and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert s.buffered == 4
+    s.close()
+
+
+def test_async_stream_drop_keeps_freshest():
+    release = threading.Event()
+
+    def produce():
+        for v in range(10):
+            yield v
+        release.set()
+
+    s = AsyncStream('a', produce, buffer_size=3, backpressure='drop')
+    s.start()
+    release.wait(5)
+
+    values = []
+    while s.has_next():
+        values += [s.forward()]
+
+    assert values == [7, 8, 9]
+
+
+def test_async_stream_timeout_policies():
+    slow = fake_producer([1, 2], delay=0.5)
+
+    s = AsyncStream('a', slow, timeout=0.01)
+    with pytest.raises(TimeoutError):
+        s.forward()
+    s.reset()
+
+    s = AsyncStream('a', slow, timeout=0.01, on_timeout='nan')
+    assert np.isnan(s.forward())
+    s.reset()
+
+    s = AsyncStream('a', slow, timeout=2, on_timeout='repeat')
+    assert s.forward() == 1
+    s.timeout = 0.01
+    assert s.forward() == 1
+    s.close()
+
+
+def test_async_stream_raises_producer_errors():
+    def produce():
+        yield 1
+        raise ConnectionError("feed down")
+
+    s = AsyncStream('a', produce)
+
+    assert s.forward() == 1
+    with pytest.raises(ConnectionError):
+        s.forward()
+
+
+def test_async_stream_reset_does_not_wait_for_blocked_producer():
+    blocked = threading.Event()
+
+    def produce():
+        yield 1
+        blocked.wait()
+        yield 2
+
+    s = AsyncStream('a', produce, join_timeout=0.1)
+    assert s.forward() == 1
+
+    start = time.perf_counter()
+    s.reset()
+    assert time.perf_counter() - start < 1
+
+    assert s.forward() == 1
+    blocked.set()
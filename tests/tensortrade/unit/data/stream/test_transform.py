@@ -1,8 +1,12 @@
 
 
 import operator
+import threading
 
-from tensortrade.data import Stream, DataFeed, Module
+from concurrent.futures import ThreadPoolExecutor
+
+from tensortrade.data import Stream, DataFeed, Module, NameMatch
+from tensortrade.data.stream.index import NameIndex
 from tensortrade.data.stream.transform import BinOp, Select
 
 
@@ -57,3 +61,58 @@ def test_select():
     feed = DataFeed()(s)
 
     assert feed.next() == {"world:/a1": 7}
+
+
+def test_select_resolves_the_first_input_through_an_index():
+    b1 = Stream("b:/total", [1, 2])
+    a1 = Stream("a:/total", [3, 4])
+    other = Stream("c:/other", [5, 6])
+
+    s = Select(NameMatch.suffix("total"))(other, a1, b1)
+    index = NameIndex([b1, other, a1])
+
+    assert s.resolve(index) is a1
+
+
+def test_namespace_is_per_thread():
+    n_threads = 8
+    barrier = threading.Barrier(n_threads)
+
+    def build(i):
+        with Module("world-{}".format(i)) as world:
+            barrier.wait()
+            a = Stream("a", [i, i + 1])
+
+            with Module("sub") as sub:
+                barrier.wait()
+                b = Stream("b", [i * 10, i * 10 + 1])
+                barrier.wait()
+
+            BinOp("c", operator.add)(a, b)
+
+        return DataFeed()(world, sub).next()
+
+    with ThreadPoolExecutor(n_threads) as executor:
+        outputs = list(executor.map(build, range(n_threads)))
+
+    for i, output in enumerate(outputs):
+        assert output == {
+            "world-{}:/a".format(i): i,
+            "world-{}:/c".format(i): 11 * i,
+            "world-{}:/sub:/b".format(i): 10 * i
+        }
+
+    assert Module.get_contexts() == []
+
+
+def test_contexts_alias_reads_the_stack_of_the_thread():
+    assert len(Module.CONTEXTS) == 0
+
+    with Module("world") as world:
+        assert len(Module.CONTEXTS) == 1
+        assert Module.CONTEXTS[-1] is world
+
+        with Module("sub") as sub:
+            assert list(Module.CONTEXTS) == [world, sub]
+
+    assert len(Module.CONTEXTS) == 0
@@ -0,0 +1,59 @@
+
+import numpy as np
+
+from tensortrade.environments import RunningNormalizer
+
+
+def test_running_statistics_match_numpy():
+    rows = np.random.RandomState(0).randn(200, 3) * [1000, 1, 0.01] + [5000, 0, 0.5]
+    normalizer = RunningNormalizer(3, dtype=np.float64)
+
+    for row in rows:
+        normalizer.update(row)
+
+    np.testing.assert_allclose(normalizer.mean, rows.mean(axis=0))
+    np.testing.assert_allclose(normalizer.var, rows.var(axis=0))
+
+
+def test_normalize_in_place():
+    normalizer = RunningNormalizer(2)
+
+    for row in [[1., 10.], [3., 30.]]:
+        normalizer.normalize(np.array(row, dtype=np.float32))
+
+    row = np.array([2., 20.], dtype=np.float32)
+    out = normalizer.normalize(row)
+
+    assert out is row
+    np.testing.assert_allclose(row, [0., 0.], atol=1e-6)
+
+
+def test_frozen_statistics_do_not_change():
+    normalizer = RunningNormalizer(1, clip=1.)
+    normalizer.normalize(np.array([0.], dtype=np.float32))
+    normalizer.normalize(np.array([2.], dtype=np.float32))
+    normalizer.freeze()
+
+    out = normalizer.normalize(np.array([100.], dtype=np.float32))
+
+    assert normalizer.count == 2
+    assert out[0] == 1.
+
+
+def test_save_and_load(tmp_path):
+    normalizer = RunningNormalizer(2)
+    for row in [[1., 5.], [2., 7.], [4., 9.]]:
+        normalizer.update(np.array(row))
+
+    path = str(tmp_path / "normalizer.npz")
+    normalizer.save(path)
+
+    restored = RunningNormalizer(2)
+    restored.load(path)
+
+    assert restored.count == 3
+    np.testing.assert_allclose(restored.mean, normalizer.mean)
+    np.testing.assert_allclose(restored.var, normalizer.var)
+
+    row = np.array([3., 3.], dtype=np.float32)
+    np.testing.assert_allclose(restored.normalize(row.copy()), normalizer.normalize(row.copy()))
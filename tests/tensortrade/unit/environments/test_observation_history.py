@@ -0,0 +1,109 @@
+
+import numpy as np
+
+from tensortrade.environments import ObservationHistory, SlidingWindowHistory
+
+
+def test_window_is_zero_padded():
+    history = ObservationHistory(window_size=3, n_features=2)
+    history.push(np.array([1, 2]))
+
+    obs = history.observe()
+
+    assert obs.dtype == np.float32
+    np.testing.assert_array_equal(obs, [[0, 0], [0, 0], [1, 2]])
+
+
+def test_window_rolls_oldest_first():
+    history = ObservationHistory(window_size=3)
+
+    for i in range(5):
+        history.push(np.array([i, 10 * i]))
+
+    obs = history.observe(copy=False)
+
+    assert obs.flags.c_contiguous
+    np.testing.assert_array_equal(obs, [[2, 20], [3, 30], [4, 40]])
+
+
+def test_push_dict_and_replace_nans():
+    history = ObservationHistory(window_size=2, dtype=np.float64)
+    history.push({"a": 1., "b": np.nan})
+    history.push({"a": np.inf, "b": 4.})
+
+    obs = history.observe()
+
+    assert obs[0, 1] == 0
+    assert obs[1, 0] == np.finfo(np.float64).max
+
+
+def test_observe_copies_by_default():
+    history = ObservationHistory(window_size=2, n_features=1)
+    history.push(np.array([1.]))
+
+    obs = history.observe()
+    history.push(np.array([2.]))
+
+    np.testing.assert_array_equal(obs, [[0], [1]])
+
+
+def test_reset():
+    history = ObservationHistory(window_size=2, n_features=1)
+    history.push(np.array([1.]))
+    history.reset()
+
+    np.testing.assert_array_equal(history.observe(), [[0], [0]])
+
+
+def test_sliding_windows_are_views():
+    features = np.arange(12, dtype=np.float64).reshape(6, 2)
+    history = SlidingWindowHistory(window_size=3, features=features, live=[1])
+
+    history.push(np.array([0., 100.]))
+    history.push(np.array([2., 101.]))
+
+    obs = history.observe()
+
+    assert np.shares_memory(obs, history.windows)
+    np.testing.assert_array_equal(obs, [[0, 0], [0, 100], [2, 101]])
+    np.testing.assert_array_equal(history.windows[1], obs)
+    assert history.windows.shape == (6, 3, 2)
+
+
+def test_sliding_window_reset_to_start():
+    features = np.arange(12, dtype=np.float64).reshape(6, 2)
+    history = SlidingWindowHistory(window_size=3, features=features, live=[1])
+
+    for i in range(4):
+        history.push(np.array([0., np.nan]))
+
+    history.reset(start=2)
+    history.push(np.array([0., 7.]))
+
+    np.testing.assert_array_equal(history.observe(), [[0, 0], [0, 0], [4, 7]])
+
+    history.reset(start=0)
+    history.push(np.array([0., 5.]))
+    history.push(np.array([0., 6.]))
+    history.push(np.array([0., 7.]))
+
+    np.testing.assert_array_equal(history.observe(), [[0, 5], [2, 6], [4, 7]])
+
+
+def test_histories_match_after_reset_to_start():
+    features = np.arange(24, dtype=np.float64).reshape(8, 3)
+
+    ring = ObservationHistory(window_size=4, n_features=3)
+    sliding = SlidingWindowHistory(window_size=4, features=features, live=[2])
+
+    for history in [ring, sliding]:
+        for row in features[:3]:
+            history.push(row)
+
+        history.reset(start=3)
+
+    for row in features[3:6]:
+        ring.push(row)
+        sliding.push(row)
+
+        np.testing.assert_array_equal(sliding.observe(), ring.observe())
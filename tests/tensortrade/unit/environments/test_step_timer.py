@@ -0,0 +1,52 @@
+
+import time
+
+import numpy as np
+
+from tensortrade.environments import StepTimer
+
+
+def record(monkeypatch, timer, times):
+    clock = np.concatenate([[0.], np.cumsum(times)])
+    for i, row in enumerate(times):
+        ticks = iter(clock[i * len(row):(i + 1) * len(row) + 1])
+        monkeypatch.setattr(time, "perf_counter", lambda: next(ticks))
+
+        timer.start()
+        for phase in StepTimer.PHASES:
+            timer.lap(phase)
+        timer.stop()
+
+
+def test_stats_over_steps(monkeypatch):
+    timer = StepTimer(capacity=2)
+    times = np.random.RandomState(0).uniform(1e-6, 1e-3, size=(10, len(StepTimer.PHASES)))
+    record(monkeypatch, timer, times)
+
+    assert timer.steps == 10
+    np.testing.assert_allclose(timer.times, times)
+
+    stats = timer.stats()
+    assert stats["feed"]["calls"] == 10
+    assert np.isclose(stats["feed"]["total_time"], times[:, 2].sum())
+    assert np.isclose(stats["reward"]["p50"], np.median(times[:, 4]))
+    assert np.isclose(stats["step"]["total_time"], times.sum())
+    assert np.isclose(stats["step"]["steps_per_second"], 10 / times.sum())
+
+    assert np.isclose(timer.last()["step"], times[-1].sum())
+
+    counts, edges = timer.histogram("broker", bins=5)
+    assert counts.sum() == 10
+    assert len(edges) == 6
+
+    assert list(timer.to_frame().index) == list(StepTimer.PHASES) + ["step"]
+
+
+def test_reset(monkeypatch):
+    timer = StepTimer()
+    record(monkeypatch, timer, np.ones((3, len(StepTimer.PHASES))))
+    timer.reset()
+
+    assert timer.steps == 0
+    assert timer.last() == {}
+    assert timer.stats()["step"]["total_time"] == 0
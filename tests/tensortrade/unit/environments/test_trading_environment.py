@@ -1,4 +1,5 @@
 
+import numpy as np
 import pandas as pd
 import pytest
 import ta
@@ -6,11 +7,12 @@ import ta
 from tensortrade.environments import TradingEnvironment
 from tensortrade.exchanges import Exchange
 from tensortrade.instruments import USD, BTC, ETH, LTC
-from tensortrade.rewards import SimpleProfit
+from tensortrade.rewards import SimpleProfit, RiskAdjustedReturns
 from tensortrade.wallets import Portfolio, Wallet
-from tensortrade.actions import ManagedRiskOrders
+from tensortrade.actions import ManagedRiskOrders, SimpleOrders
 from tensortrade.data import DataFeed, Stream, Module
 from tensortrade.exchanges.services.execution.simulated import execute_order
+from tensortrade.orders import TradeSide
 
 
 @pytest.fixture
@@ -196,3 +198,430 @@ def test_runs_with_external_feed_only(portfolio):
 
     n_features = coinbase_btc.shape[1] + coinbase_eth.shape[1]
     assert obs.shape == (50, n_features)
+
+
+def test_observation_matches_space(portfolio):
+
+    env = TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=ManagedRiskOrders(),
+        reward_scheme=SimpleProfit(),
+        window_size=5,
+        enable_logger=False
+    )
+
+    obs = env.reset()
+    assert obs["real_obs"].shape == env.observation_space["real_obs"].shape
+
+    obs, reward, done, info = env.step(0)
+    assert obs["real_obs"].shape == env.observation_space["real_obs"].shape
+    assert obs["real_obs"].dtype == np.float32
+
+
+def test_external_feed_only_prunes_wallet_balances(portfolio):
+
+    with Module("coinbase") as coinbase:
+        Stream("volume", list(range(100)))
+
+    env = TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=ManagedRiskOrders(),
+        reward_scheme=SimpleProfit(),
+        feed=DataFeed([coinbase]),
+        window_size=5,
+        use_internal=False,
+        enable_logger=False
+    )
+
+    pruned = [node.name for node in env.feed.pruned]
+
+    assert "coinbase:/BTC:/free" in pruned
+    assert "coinbase:/BTC:/total" not in pruned
+
+    env.reset()
+    obs, reward, done, info = env.step(0)
+
+    assert obs["real_obs"].shape == (5, 1 + len(portfolio.wallets))
+    assert portfolio.net_worth > 0
+
+
+def test_environments_share_market_data():
+    from tensortrade.data import MarketData
+    from tensortrade.data.stream.indicators import RollingMean
+
+    close = Stream("close", list(np.linspace(100, 200, 60)))
+    market = MarketData([close, RollingMean("sma", 5)(close)])
+
+    def make_env():
+        coinbase = Exchange("coinbase", service=execute_order)(*market.streams({"close": "USD-BTC"}))
+        portfolio = Portfolio(USD, [Wallet(coinbase, 10000 * USD), Wallet(coinbase, 1 * BTC)])
+
+        return TradingEnvironment(
+            portfolio=portfolio,
+            action_scheme=ManagedRiskOrders(),
+            reward_scheme=SimpleProfit(),
+            feed=market.feed(),
+            window_size=3,
+            enable_logger=False
+        )
+
+    envs = [make_env() for _ in range(2)]
+
+    for env in envs:
+        assert np.shares_memory(env.feed._static.values, market.values)
+        env.reset()
+
+    envs[0].step(0)
+    obs, reward, done, info = envs[0].step(0)
+
+    assert envs[0].portfolio.exchanges[0].quote_price(USD / BTC) == market.values[2, 0]
+    assert envs[1].portfolio.exchanges[0].quote_price(USD / BTC) == market.values[0, 0]
+    assert obs["real_obs"][-1, 0] == np.float32(market.values[2, 0])
+
+
+def test_sliding_windows_match_observation_history():
+    from tensortrade.data import MarketData
+
+    close = list(np.linspace(100, 200, 30))
+    market = MarketData([Stream("close", close), Stream("volume", list(range(30)))])
+
+    def make_env(sliding_windows):
+        coinbase = Exchange("coinbase", service=execute_order)(*market.streams({"close": "USD-BTC"}))
+        portfolio = Portfolio(USD, [Wallet(coinbase, 10000 * USD), Wallet(coinbase, 1 * BTC)])
+
+        return TradingEnvironment(
+            portfolio=portfolio,
+            action_scheme=ManagedRiskOrders(),
+            reward_scheme=SimpleProfit(),
+            feed=market.feed(),
+            window_size=4,
+            enable_logger=False,
+            sliding_windows=sliding_windows
+        )
+
+    env, sliding = make_env(False), make_env(True)
+
+    for _ in range(2):
+        np.testing.assert_allclose(env.reset()["real_obs"], sliding.reset()["real_obs"])
+
+        for action in [0, 1, 0, 0, 5, 0]:
+            obs, _, _, _ = env.step(action)
+            sliding_obs, _, _, _ = sliding.step(action)
+
+            np.testing.assert_allclose(obs["real_obs"], sliding_obs["real_obs"], rtol=1e-6)
+
+
+def test_normalized_observations(portfolio):
+    env = TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=ManagedRiskOrders(),
+        reward_scheme=SimpleProfit(),
+        window_size=5,
+        enable_logger=False,
+        normalizer=True
+    )
+
+    env.reset()
+    for _ in range(10):
+        obs, reward, done, info = env.step(0)
+
+    assert env.normalizer.count == 11
+    assert np.abs(obs["real_obs"][-1]).max() < 10
+
+
+def test_action_mask_follows_empty_wallets(portfolio):
+    env = TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=ManagedRiskOrders(),
+        reward_scheme=SimpleProfit(),
+        window_size=5,
+        enable_logger=False
+    )
+
+    actions = env.action_scheme.actions
+    buys = [i for i, a in enumerate(actions) if a is not None and a[1][-1] == TradeSide.BUY]
+    ltc_sells = [i for i, a in enumerate(actions)
+                 if a is not None and a[1][-1] == TradeSide.SELL and str(a[0][1]) == "USD/LTC"]
+
+    obs = env.reset()
+    mask = obs["action_mask"]
+
+    assert obs["avail_actions"].shape == (env.action_space.n, 1)
+    assert not mask[ltc_sells].any()
+    assert mask.sum() == env.action_space.n - len(ltc_sells)
+
+    ltc = [w for w in portfolio.wallets if w.instrument == LTC][0]
+    ltc.balance = 10 * LTC
+
+    for wallet in portfolio.wallets:
+        if wallet.instrument == USD:
+            wallet.balance = 0 * USD
+
+    env.update_avail_actions()
+    mask = env.action_mask
+
+    assert mask[ltc_sells].all()
+    assert not mask[buys].any()
+    assert mask.sum() == env.action_space.n - len(buys)
+
+    obs = env.reset()
+    assert not obs["action_mask"][ltc_sells].any()
+    assert obs["action_mask"][buys].all()
+
+
+def test_action_mask_keeps_hold_with_simple_orders(portfolio):
+    env = TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=SimpleOrders(),
+        reward_scheme=SimpleProfit(),
+        window_size=5,
+        enable_logger=False
+    )
+    env.reset()
+
+    assert env.action_scheme.actions[0][1][-1] == TradeSide.BUY
+
+    for wallet in portfolio.wallets:
+        if wallet.instrument == USD:
+            wallet.balance = 0 * USD
+
+    env.update_avail_actions()
+
+    assert env.action_mask[0] == 1
+    assert env.action_scheme.get_order(0, portfolio) is None
+
+def test_step_timings(portfolio):
+    env = TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=ManagedRiskOrders(),
+        reward_scheme=SimpleProfit(),
+        window_size=5,
+        enable_logger=False,
+        timer=True,
+        timings_in_info=True
+    )
+
+    env.reset()
+    for _ in range(10):
+        obs, reward, done, info = env.step(0)
+
+    stats = env.stats()
+    assert stats["step"]["calls"] == 10
+    assert stats["feed"]["total_time"] > 0
+    assert set(info["timings"].keys()) == set(env.timer.PHASES) | {"step"}
+
+    env.reset()
+    assert env.stats()["step"]["calls"] == 0
+
+
+def test_snapshot_restore_replays_rollouts(portfolio):
+    env = TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=ManagedRiskOrders(durations=[4]),
+        reward_scheme=SimpleProfit(),
+        window_size=5,
+        enable_logger=False
+    )
+
+    def rollout(actions):
+        steps = [env.step(action) for action in actions]
+        balances = [(w.balance, w.locked_balance) for w in portfolio.wallets]
+        return steps, balances, env.portfolio.net_worth, len(env.broker.executed), len(env.portfolio.performance)
+
+    env.reset()
+    for action in [0, 5, 0, 30]:
+        env.step(action)
+
+    state = env.snapshot()
+    steps, balances, net_worth, executed, performance = rollout([5, 0, 60, 0, 0])
+
+    obs = env.restore(state)
+    rollout([7, 100, 0, 3, 0])
+    env.restore(state)
+    replayed_steps, replayed_balances, replayed_net_worth, replayed_executed, replayed_performance = \
+        rollout([5, 0, 60, 0, 0])
+
+    assert obs["real_obs"].shape == (5, env.observation_space["real_obs"].shape[1])
+    assert replayed_balances == balances
+    assert replayed_net_worth == net_worth
+    assert replayed_executed == executed
+    assert replayed_performance == performance
+
+    for (obs, reward, done, info), (replayed_obs, replayed_reward, replayed_done, replayed_info) in \
+            zip(steps, replayed_steps):
+        np.testing.assert_array_equal(obs["real_obs"], replayed_obs["real_obs"])
+        np.testing.assert_array_equal(obs["action_mask"], replayed_obs["action_mask"])
+        assert reward == replayed_reward
+        assert info["step"] == replayed_info["step"]
+
+
+@pytest.mark.parametrize("reward_scheme", [SimpleProfit, RiskAdjustedReturns])
+def test_repeated_steps_match_single_steps(portfolio, reward_scheme):
+    env = TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=ManagedRiskOrders(durations=[4]),
+        reward_scheme=reward_scheme(),
+        window_size=5,
+        enable_logger=False
+    )
+
+    env.reset()
+    env.step(0)
+    state = env.snapshot()
+
+    expected = 0
+    for action in [5] + [0] * 11:
+        obs, reward, done, info = env.step(action)
+        expected += reward
+
+    net_worth = env.portfolio.net_worth
+    step = env.clock.step
+
+    env.restore(state)
+    repeated_obs, repeated_reward, repeated_done, repeated_info = env.step(5, repeat=12)
+
+    np.testing.assert_allclose(repeated_obs["real_obs"], obs["real_obs"], rtol=1e-6)
+    np.testing.assert_array_equal(repeated_obs["action_mask"], obs["action_mask"])
+    assert np.isclose(repeated_reward, expected)
+    assert repeated_done == done
+    assert repeated_info["steps"] == 12
+    assert repeated_info["step"] == info["step"]
+    assert env.clock.step == step
+    assert env.portfolio.net_worth == net_worth
+
+
+def test_repeated_steps_reject_non_finite_rewards(portfolio):
+    class NaNProfit(SimpleProfit):
+
+        def get_rewards(self, portfolio, n):
+            rewards = super().get_rewards(portfolio, n)
+            rewards[-1] = np.nan
+            return rewards
+
+    env = TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=ManagedRiskOrders(),
+        reward_scheme=NaNProfit(),
+        window_size=5,
+        enable_logger=False
+    )
+
+    env.reset()
+
+    with pytest.raises(ValueError):
+        env.step(0, repeat=5)
+
+def test_repeated_steps_end_with_episode(portfolio):
+    env = TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=ManagedRiskOrders(),
+        reward_scheme=SimpleProfit(),
+        window_size=5,
+        enable_logger=False
+    )
+
+    env.reset()
+    obs, reward, done, info = env.step(0, repeat=1000)
+
+    assert done
+    assert info["steps"] == 99
+    assert not env.feed.has_next()
+
+
+def test_flat_observations():
+    close = list(np.linspace(100, 200, 30))
+
+    def make_env(flat):
+        coinbase = Exchange("coinbase", service=execute_order)(Stream("USD-BTC", close))
+
+        return TradingEnvironment(
+            portfolio=Portfolio(USD, [Wallet(coinbase, 10000 * USD), Wallet(coinbase, 10 * BTC)]),
+            action_scheme=ManagedRiskOrders(),
+            reward_scheme=SimpleProfit(),
+            window_size=5,
+            enable_logger=False,
+            flat_observations=flat
+        )
+
+    env, flat = make_env(False), make_env(True)
+
+    expected = env.reset()
+    obs = flat.reset()
+    n = flat.action_space.n
+
+    assert flat.observation_buffer.flags.c_contiguous
+    assert flat.observation_buffer.shape == (n + obs["real_obs"].size,)
+    assert np.shares_memory(obs["action_mask"], flat.observation_buffer[:n])
+    assert np.shares_memory(obs["real_obs"], flat.observation_buffer[n:])
+
+    for action in [0, 5, 0, 0, 60, 0]:
+        np.testing.assert_array_equal(obs["real_obs"], expected["real_obs"])
+        np.testing.assert_array_equal(obs["action_mask"], expected["action_mask"])
+
+        expected, _, _, _ = env.step(action)
+        next_obs, _, _, _ = flat.step(action)
+
+        assert next_obs is obs
+
+
+def test_restore_keeps_ledgers_of_other_environments():
+    close = list(np.linspace(100, 200, 30))
+
+    def make_env():
+        coinbase = Exchange("coinbase", service=execute_order)(Stream("USD-BTC", close))
+
+        return TradingEnvironment(
+            portfolio=Portfolio(USD, [Wallet(coinbase, 10000 * USD), Wallet(coinbase, 10 * BTC)]),
+            action_scheme=ManagedRiskOrders(),
+            reward_scheme=SimpleProfit(),
+            window_size=5,
+            enable_logger=False
+        )
+
+    env, other = make_env(), make_env()
+    env.reset()
+    other.reset()
+
+    state = env.snapshot()
+
+    for action in [5, 0, 60]:
+        env.step(action)
+        other.step(action)
+
+    n_transactions = len(other.portfolio.ledger.transactions)
+    assert n_transactions > 0
+    assert env.portfolio.ledger is not other.portfolio.ledger
+
+    env.restore(state)
+
+    assert len(env.portfolio.ledger.transactions) == 0
+    assert len(other.portfolio.ledger.transactions) == n_transactions
+
+
+def test_init_evaluates_columnar_feed_once(portfolio):
+    from tensortrade.data import ArrayStream
+
+    class CountingStream(ArrayStream):
+        calls = 0
+
+        def precompute(self, inputs):
+            CountingStream.calls += 1
+            return super().precompute(inputs)
+
+    with Module("coinbase") as coinbase:
+        CountingStream("volume", np.arange(100, dtype=np.float64))
+
+    feed = DataFeed([coinbase], columnar=True)
+
+    TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=ManagedRiskOrders(),
+        reward_scheme=SimpleProfit(),
+        feed=feed,
+        window_size=5,
+        use_internal=False,
+        enable_logger=False
+    )
+
+    assert not feed.compiled
+    assert CountingStream.calls == 1
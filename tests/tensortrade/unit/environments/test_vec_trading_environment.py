@@ -0,0 +1,146 @@
+
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from tensortrade.actions import ManagedRiskOrders
+from tensortrade.data import MarketData, Stream
+from tensortrade.environments import TradingEnvironment, VecTradingEnvironment
+from tensortrade.exchanges import Exchange
+from tensortrade.exchanges.services.execution.simulated import execute_order
+from tensortrade.instruments import USD, BTC
+from tensortrade.rewards import SimpleProfit
+from tensortrade.wallets import Portfolio, Wallet
+
+
+requires_shared_memory = pytest.mark.skipif(sys.version_info < (3, 8), reason="requires multiprocessing.shared_memory")
+
+
+@pytest.fixture
+def market():
+    return MarketData([
+        Stream("close", list(np.linspace(100, 200, 12))),
+        Stream("volume", list(range(12)))
+    ])
+
+
+def make_env(market, window_size=3):
+    coinbase = Exchange("coinbase", service=execute_order)(*market.streams({"close": "USD-BTC"}))
+    portfolio = Portfolio(USD, [Wallet(coinbase, 10000 * USD), Wallet(coinbase, 1 * BTC)])
+
+    return TradingEnvironment(
+        portfolio=portfolio,
+        action_scheme=ManagedRiskOrders(),
+        reward_scheme=SimpleProfit(),
+        feed=market.feed(),
+        window_size=window_size,
+        enable_logger=False
+    )
+
+
+def test_reset_stacks_observations(market):
+    env = VecTradingEnvironment([make_env(market) for _ in range(3)], starts=[0, 4, 8])
+
+    obs = env.reset()
+
+    assert env.num_envs == 3
+    assert obs["real_obs"].shape == (3,) + env.observation_space["real_obs"].shape
+    assert obs["action_mask"].shape == (3, env.action_space.n)
+
+    volumes = obs["real_obs"][:, -1, 1]
+    np.testing.assert_array_equal(volumes, [0, 4, 8])
+
+
+def test_step_auto_resets(market):
+    env = VecTradingEnvironment([make_env(market) for _ in range(2)], starts=lambda i: 9 * i)
+    env.reset()
+
+    obs, rewards, dones, infos = env.step(np.zeros(2, dtype=np.int64))
+
+    assert rewards.shape == (2,)
+    np.testing.assert_array_equal(dones, [False, False])
+
+    obs, rewards, dones, infos = env.step([0, 0])
+
+    np.testing.assert_array_equal(dones, [False, True])
+    assert infos[1]["terminal_observation"]["real_obs"][-1, 1] == 11
+    assert obs["real_obs"][1, -1, 1] == 9
+    assert obs["real_obs"][0, -1, 1] == 2
+
+
+def test_requires_one_action_per_env(market):
+    env = VecTradingEnvironment([make_env(market), make_env(market)])
+    env.reset()
+
+    with pytest.raises(ValueError):
+        env.step([0])
+
+
+def test_requires_matching_spaces(market):
+    with pytest.raises(ValueError):
+        VecTradingEnvironment([make_env(market, 3), make_env(market, 4)])
+
+
+@requires_shared_memory
+def test_subprocess_envs_match_in_process_envs(market):
+    from functools import partial
+    from tensortrade.environments import SubprocVecTradingEnvironment
+
+    starts = [0, 3, 6, 9]
+    env_fns = [partial(make_env, market) for _ in starts]
+
+    local = VecTradingEnvironment([env_fn() for env_fn in env_fns], starts=starts)
+    remote = SubprocVecTradingEnvironment(env_fns, n_workers=2, starts=starts)
+
+    try:
+        np.testing.assert_allclose(remote.reset()["real_obs"], local.reset()["real_obs"])
+
+        for actions in [[0, 0, 0, 0], [1, 0, 2, 0], [0, 0, 0, 0]]:
+            obs, rewards, dones, infos = remote.step(actions)
+            local_obs, local_rewards, local_dones, local_infos = local.step(actions)
+
+            for key in obs.keys():
+                np.testing.assert_allclose(obs[key], local_obs[key], rtol=1e-6)
+
+            np.testing.assert_allclose(rewards, local_rewards)
+            np.testing.assert_array_equal(dones, local_dones)
+            assert [info["step"] for info in infos] == [info["step"] for info in local_infos]
+    finally:
+        remote.close()
+
+    assert all(not process.is_alive() for process in remote._processes)
+
+
+def make_hanging_env(market):
+    env = make_env(market)
+    env.close = lambda: time.sleep(60)
+
+    return env
+
+
+@requires_shared_memory
+def test_subprocess_env_close_terminates_hung_workers(market):
+    from functools import partial
+    from tensortrade.environments import SubprocVecTradingEnvironment
+
+    remote = SubprocVecTradingEnvironment([partial(make_hanging_env, market)], n_workers=1, join_timeout=0.5)
+    remote.reset()
+
+    start = time.perf_counter()
+    remote.close()
+
+    assert time.perf_counter() - start < 10
+    assert all(not process.is_alive() for process in remote._processes)
+
+
+@requires_shared_memory
+def test_subprocess_env_reports_worker_errors():
+    from tensortrade.environments import SubprocVecTradingEnvironment
+
+    def broken():
+        raise RuntimeError("no market")
+
+    with pytest.raises(RuntimeError, match="no market"):
+        SubprocVecTradingEnvironment([broken], n_workers=1)
@@ -310,3 +310,44 @@ def test_reset(mock_exchange_class):
     assert broker.unexecuted == []
     assert broker.executed == {}
     assert broker.trades == {}
+
+
+@mock.patch('tensortrade.exchanges.Exchange')
+def test_snapshot_restore(mock_exchange_class):
+
+    exchange = mock_exchange_class.return_value
+    exchange.id = "fake_exchange_id"
+    exchange.name = "coinbase"
+
+    wallets = [Wallet(exchange, 10000 * USD), Wallet(exchange, 0 * BTC)]
+    portfolio = Portfolio(USD, wallets)
+
+    broker = Broker(exchange)
+
+    order = Order(step=0,
+                  exchange_name="coinbase",
+                  side=TradeSide.BUY,
+                  trade_type=TradeType.MARKET,
+                  pair=USD / BTC,
+                  quantity=5200.00 * USD,
+                  portfolio=portfolio,
+                  price=7000.00)
+    order.is_executable_on = mock.MagicMock(return_value=True)
+    order.add_order_spec(mock.Mock())
+    broker.submit(order)
+
+    state = broker.snapshot()
+
+    broker.update()
+    order.cancel()
+
+    assert order.id in broker.executed
+    assert order.status == OrderStatus.CANCELLED
+
+    broker.restore(state)
+
+    assert broker.unexecuted == [order]
+    assert broker.executed == {}
+    assert order.status == OrderStatus.PENDING
+    assert len(order._specs) == 1
+    assert order._listeners == []
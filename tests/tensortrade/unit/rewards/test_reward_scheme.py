@@ -1,6 +1,11 @@
+import pytest
+import pandas as pd
+
 from tensortrade import TradingContext
-from tensortrade.rewards import get, RewardScheme
+from tensortrade.rewards import get, RewardScheme, RiskAdjustedReturns
 from tensortrade.orders import Trade
+from tensortrade.wallets import Portfolio
+from tensortrade.instruments import USD
 
 
 class ConcreteRewardScheme(RewardScheme):
@@ -39,3 +44,19 @@ def test_injects_string_intialized_reward_scheme():
         assert hasattr(reward_scheme.context, 'size')
         assert reward_scheme.context.size == 0
         assert reward_scheme.context['size'] == 0
+
+
+def test_get_rewards_defaults_to_get_reward_at_each_step():
+    net_worths = pd.Series([100, 400, 350, 450, 200, 400, 330, 560], name="net_worth")
+    reward_scheme = RiskAdjustedReturns(return_algorithm='sharpe', window_size=3)
+    portfolio = Portfolio(USD)
+
+    expected = []
+    for t in range(len(net_worths)):
+        portfolio._performance = pd.DataFrame({'net_worth': net_worths[:t + 1]})
+        expected += [reward_scheme.get_reward(portfolio)]
+
+    rewards = reward_scheme.get_rewards(portfolio, 5)
+
+    assert list(rewards) == pytest.approx(expected[-5:])
+    assert len(portfolio.performance) == len(net_worths)
@@ -24,3 +24,15 @@ class TestSimpleProfit:
         reward_scheme.window_size = 3
         reward = ((1 + pct_chg.iloc[-1]) * (1 + pct_chg.iloc[-2]) * (1 + pct_chg.iloc[-3])) - 1
         assert reward_scheme.get_reward(portfolio) == reward
+
+    @pytest.mark.parametrize("window_size", [1, 3])
+    def test_get_rewards_matches_get_reward(self, net_worths, window_size):
+        reward_scheme = SimpleProfit(window_size=window_size)
+        portfolio = Portfolio(USD)
+
+        expected = []
+        for t in range(len(net_worths)):
+            portfolio._performance = pd.DataFrame({'net_worth': net_worths[:t + 1]})
+            expected += [reward_scheme.get_reward(portfolio)]
+
+        assert list(reward_scheme.get_rewards(portfolio, 5)) == pytest.approx(expected[-5:])
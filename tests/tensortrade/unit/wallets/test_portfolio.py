@@ -5,6 +5,10 @@ import unittest.mock as mock
 from tensortrade.base.core import Clock
 from tensortrade.wallets import Wallet, Portfolio
 from tensortrade.instruments import USD, BTC, ETH, XRP, BCH
+from tensortrade.exchanges import Exchange
+from tensortrade.exchanges.services.execution.simulated import execute_order
+from tensortrade.data import Stream
+from tensortrade.data.internal import create_internal_feed
 
 
 @pytest.fixture
@@ -202,3 +206,30 @@ def test_remove_pair(portfolio, exchange):
     portfolio.remove_pair(exchange, BTC)
 
     assert wallet_btc not in portfolio.wallets
+
+
+def test_on_next_many():
+    def build():
+        ex = Exchange("coinbase", service=execute_order)(
+            Stream("USD-BTC", [7000, 7500, 8300]),
+            Stream("USD-ETH", [200, 212, 400])
+        )
+        return Portfolio(USD, [
+            Wallet(ex, 10000 * USD),
+            Wallet(ex, 10 * BTC),
+            Wallet(ex, 5 * ETH),
+        ])
+
+    stepped = build()
+    feed = create_internal_feed(stepped)
+    for _ in range(3):
+        feed.next()
+
+    batched = build()
+    feed = create_internal_feed(batched)
+    feed.next_many(3)
+
+    assert batched.initial_net_worth == stepped.initial_net_worth
+    assert batched.net_worth == stepped.net_worth
+    assert list(batched.performance.columns) == list(stepped.performance.columns)
+    assert (batched.performance.values == stepped.performance.values).all()
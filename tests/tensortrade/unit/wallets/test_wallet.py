@@ -150,3 +150,19 @@ def test_total_balance():
     wallet += Quantity(USD, 700, path_id=other_id)
 
     assert wallet.total_balance == 11200 * USD
+
+
+def test_snapshot_restore():
+    wallet = Wallet(exchange, 10000 * USD)
+    wallet += Quantity(USD, 500, path_id=path_id)
+
+    state = wallet.snapshot()
+
+    wallet -= 2000 * USD
+    wallet += Quantity(USD, 700, path_id=other_id)
+    wallet.deallocate(path_id)
+
+    wallet.restore(state)
+
+    assert wallet.balance == 10000 * USD
+    assert wallet.locked == {path_id: 500 * USD}